@@ -3,49 +3,78 @@ Omni-Scribe Impact Analyzer
 Orchestrates a swarm to propagate changes through the dependency graph.
 """
 from core.manager import SwarmManager
+from apps.oracle.impact_cache import ImpactCache
 from engine.context_bus import ContextBus
 from utils.hpc_utils import HPCUtils
 
 class ImpactAnalyzer:
-    def __init__(self, bus: ContextBus):
+    def __init__(self, bus: ContextBus, cache_size: int = 1024):
         self.bus = bus
         self.swarm = SwarmManager(swarm_size=8)
+        # Repeated queries against an unchanged cone are answered without the swarm
+        self.cache = ImpactCache(bus, max_entries=cache_size)
         print("[OMNI-SCRIBE] ImpactAnalyzer initialized with 8-worker Swarm.")
 
     @HPCUtils.benchmark_latency
-    def analyze_change(self, modified_file: str):
+    def analyze_change(self, modified_file: str, max_depth: int = None):
         """
         Determines the global impact of a change in 'modified_file'.
-        Dispatches analysis tasks to the swarm in parallel.
+        Only the transitive dependents found in the bus's dependency index are audited,
+        dispatched to the swarm in parallel. Returns the audited files.
         """
-        context = self.bus.get_context()
-        impacted_files = []
-        
-        # Simulate dependency discovery
-        # In production, this reads the pre-calculated dependency graph from memory
-        tasks = []
-        for file_path, ast_summary in context.items():
-            if file_path != modified_file:
-                tasks.append({
-                    "id": file_path,
-                    "name": f"Audit_{file_path}",
-                    "complexity": 1,
-                    "target": modified_file
-                })
-        
-        print(f"[OMNI-SCRIBE] Dispatching {len(tasks)} impact audits to swarm...")
-        results = self.swarm.dispatch_batch(tasks)
-        return [r['worker_id'] for r in results if r['status'] == 'COMPLETED']
+        cached = self.cache.get(modified_file, max_depth)
+        if cached is not None:
+            return cached
+        graph_version = self.bus.dependencies.version # Read first: the cache checks every change after it
+        cone = self.bus.dependencies.dependents(modified_file, max_depth)
+        audited = self._audit({file_path: modified_file for file_path in cone})
+        self.cache.put(modified_file, max_depth, audited, cone, graph_version)
+        return audited
+
+    @HPCUtils.benchmark_latency
+    def analyze_changes(self, modified_files: list, max_depth: int = None):
+        """
+        Audits the union of the dependents of several changed files in one swarm pass.
+        """
+        dependents = {}
+        for modified_file in modified_files:
+            for file_path in self.bus.dependencies.dependents(modified_file, max_depth):
+                dependents.setdefault(file_path, modified_file)
+        return self._audit(dependents)
+
+    def _audit(self, dependents: dict) -> list:
+        """Dispatches one audit per dependent file (dependent -> changed file it depends on)."""
+        # Every audit of this pass reads the same pinned version, whatever hydration does meanwhile
+        snapshot = self.bus.snapshot()
+        dependents = {file_path: target for file_path, target in dependents.items() if file_path in snapshot}
+
+        tasks = (
+            {
+                "id": file_path,
+                "name": f"Audit_{file_path}",
+                "complexity": 1,
+                "target": target,
+                "summary": snapshot[file_path],
+                "version": snapshot.version
+            }
+            for file_path, target in dependents.items()
+        )
+
+        print(f"[OMNI-SCRIBE] Streaming {len(dependents)} impact audits to swarm...")
+        # Audits are produced, executed and consumed concurrently with a bounded in-flight window
+        return [r['task_id'] for r in self.swarm.dispatch_stream(tasks) if r['status'] == 'COMPLETED']
 
     def shutdown(self):
         self.swarm.shutdown()
 
 if __name__ == "__main__":
     bus = ContextBus()
-    # Mock some project context
+    # Mock some project context: every tenth module depends on core_lib
+    bus.update_file_state("core_lib.py", {"functions": ["foo"]})
     for i in range(100):
-        bus.update_file_state(f"module_{i}.py", {"functions": ["foo"]})
+        imports = [("core_lib", "foo", None, 1)] if i % 10 == 0 else []
+        bus.update_file_state(f"module_{i}.py", {"functions": ["foo"], "imports": imports})
         
     analyzer = ImpactAnalyzer(bus)
-    analyzer.analyze_change("core_lib.py")
+    print(f"[OMNI-SCRIBE] Audited: {analyzer.analyze_change('core_lib.py')}")
     analyzer.shutdown()
@@ -0,0 +1,145 @@
+"""
+Omni-Scribe Impact Cache
+Memoized impact-analysis results, invalidated precisely when their dependency cone changes.
+"""
+import collections
+import threading
+from typing import List, Optional
+from engine.context_bus import CONTEXT_UPDATE, ContextBus
+from engine.dependency_index import module_name
+
+# Graph changes remembered for validating entries and results computed at older versions
+JOURNAL_SIZE = 65536
+
+class ImpactCache:
+    """
+    LRU of analyze_change results keyed by (modified file, max_depth).
+    Each entry remembers its cone (the modified file plus its dependents) and the dependency
+    graph version it is known to be valid at. Update notifications are drained from the bus's
+    CONTEXT_UPDATE topic on every lookup: a change to a file inside a cone, or a file that now
+    imports a module of a cone (a new dependent), evicts exactly the affected entries.
+    The graph is updated before its notification is published, so an entry (or a result being
+    stored) is only trusted at a newer graph version once the notification of every version in
+    between has been drained and found not to touch its cone.
+    """
+    def __init__(self, bus: ContextBus, max_entries: int = 1024):
+        self.bus = bus
+        self.max_entries = max_entries
+        self._entries = collections.OrderedDict() # key -> (graph version, result, cone files, cone modules)
+        self._by_file = collections.defaultdict(set)
+        self._by_module = collections.defaultdict(set)
+        self._updates = bus.subscribe_topic(CONTEXT_UPDATE)
+        self._journal = {} # graph version -> (changed file, modules it imports)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _sync_locked(self):
+        missed = self._updates.missed
+        updates = self._updates.read()
+        if self._updates.missed != missed:
+            self._clear_locked() # Notifications were lost: nothing can be trusted
+            self._journal.clear()
+            return
+        forward = self.bus.dependencies.forward
+        for update in updates:
+            file_path = update["file"]
+            modules = frozenset(forward.get(file_path, ()))
+            if update.get("graph_version") is not None:
+                self._journal[update["graph_version"]] = (file_path, modules)
+            keys = set(self._by_file.get(file_path, ()))
+            for module in modules:
+                keys.update(self._by_module.get(module, ()))
+            for key in keys:
+                self._drop_locked(key)
+                self.invalidations += 1
+        while len(self._journal) > JOURNAL_SIZE:
+            del self._journal[next(iter(self._journal))]
+
+    def _unchanged_locked(self, since: int, until: int, cone_files: set, cone_modules: set) -> bool:
+        """True if every graph change in (since, until] has been drained and none touches the cone."""
+        for version in range(since + 1, until + 1):
+            change = self._journal.get(version)
+            if change is None:
+                return False # Not published yet, lost, or made without a notification
+            file_path, modules = change
+            if file_path in cone_files or not modules.isdisjoint(cone_modules):
+                return False
+        return True
+
+    def _drop_locked(self, key):
+        _, _, cone_files, cone_modules = self._entries.pop(key)
+        for index, members in ((self._by_file, cone_files), (self._by_module, cone_modules)):
+            for member in members:
+                keys = index.get(member)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del index[member]
+
+    def _clear_locked(self):
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+        self._by_file.clear()
+        self._by_module.clear()
+
+    def get(self, modified_file: str, max_depth: int = None) -> Optional[List[str]]:
+        key = (modified_file, max_depth)
+        with self._lock:
+            self._sync_locked()
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            graph_version, result, cone_files, cone_modules = entry
+            current = self.bus.dependencies.version
+            if current != graph_version:
+                if not self._unchanged_locked(graph_version, current, cone_files, cone_modules):
+                    self.misses += 1
+                    return None
+                self._entries[key] = (current, result, cone_files, cone_modules)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, modified_file: str, max_depth: int, result: List[str], cone: List[str], graph_version: int):
+        """
+        Stores a result whose cone is modified_file + `cone`; `graph_version` must be read before
+        the cone was computed. The result is dropped if the graph has since changed in a way that
+        may touch the cone, or that cannot be verified yet.
+        """
+        key = (modified_file, max_depth)
+        dependencies = self.bus.dependencies
+        cone_files = {modified_file, *cone}
+        cone_modules = {dependencies.modules.get(f) or module_name(f, dependencies.root) for f in cone_files}
+        with self._lock:
+            self._sync_locked()
+            current = dependencies.version
+            if not self._unchanged_locked(graph_version, current, cone_files, cone_modules):
+                return
+            if key in self._entries:
+                self._drop_locked(key)
+            self._entries[key] = (current, tuple(result), cone_files, cone_modules)
+            for member in cone_files:
+                self._by_file[member].add(key)
+            for member in cone_modules:
+                self._by_module[member].add(key)
+            while len(self._entries) > self.max_entries:
+                self._drop_locked(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._clear_locked()
+            self._journal.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "graph_version": self.bus.dependencies.version
+        }
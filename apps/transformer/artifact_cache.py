@@ -0,0 +1,84 @@
+"""
+Antigravity Transformer: Artifact Cache
+Content-addressed on-disk cache of per-stage transformation artifacts with size-bounded LRU eviction.
+"""
+import collections
+import hashlib
+import threading
+from typing import Optional, Sequence
+from engine.persistent_store import SegmentStore
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+class ArtifactCache:
+    """
+    Stores each stage output under sha256(stage, stage version, input content hash, upstream
+    artifact hashes), so an artifact is reused exactly when its input and everything it was derived
+    from are unchanged. Artifacts are appended to a SegmentStore (one small file per artifact costs
+    far more in syscalls than the artifact itself); once the cache exceeds `max_bytes` the least
+    recently used artifacts are deleted and the store is compacted when they outweigh the live ones.
+    Recency is kept in memory; after a restart, entries start out in the order they were written.
+    """
+    def __init__(self, cache_dir: str, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.store = SegmentStore(cache_dir)
+        self._lock = threading.Lock()
+        self._sizes = collections.OrderedDict() # key -> bytes, least recently used first
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._evicted_bytes = 0 # Dead bytes since the last compaction
+        for key, (_, _, size) in self.store.index.items():
+            self._sizes[key] = size
+            self.total_bytes += size
+
+    @staticmethod
+    def key(stage: str, stage_version: str, input_hash: str, upstream_hashes: Sequence[str] = ()) -> str:
+        return content_hash("\0".join([stage, stage_version, input_hash, *upstream_hashes]).encode())
+
+    def get(self, key: str) -> Optional[str]:
+        artifact = self.store.get(key)
+        with self._lock:
+            if artifact is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if key in self._sizes:
+                self._sizes.move_to_end(key)
+        return artifact
+
+    def put(self, key: str, artifact: str):
+        with self._lock:
+            self.store.put(key, artifact)
+            size = self.store.index[key][2]
+            self.total_bytes += size - self._sizes.pop(key, 0)
+            self._sizes[key] = size
+            while self.total_bytes > self.max_bytes and len(self._sizes) > 1:
+                victim, victim_size = self._sizes.popitem(last=False)
+                self.total_bytes -= victim_size
+                self._evicted_bytes += victim_size
+                self.evictions += 1
+                self.store.delete(victim)
+            if self._evicted_bytes > self.total_bytes:
+                self.store.compact()
+                self._evicted_bytes = 0
+
+    def flush(self):
+        self.store.flush()
+
+    def close(self):
+        self.store.close()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._sizes),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
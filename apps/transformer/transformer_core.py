@@ -2,48 +2,229 @@
 Antigravity Transformer: Core Orchestrator
 Manages the transformation lifecycle from Analysis to Synthesis.
 """
+import queue
+import threading
 import time
+from core.autoscaler import StageAutoscaler
 from core.manager import SwarmManager
 from engine.context_bus import ContextBus
+from apps.transformer.artifact_cache import ArtifactCache, content_hash
+from apps.transformer.wavefront import WavefrontPlan
 from apps.transformer.translation_agents import TypeInferrer, Modularizer, LogicTranslator
 from utils.hpc_utils import HPCUtils
 
+# Marks the end of a stage's input stream
+_END = object()
+# How long a stage waits on an empty inbox before it collects its finished results
+STARVED_POLL_INTERVAL = 0.002
+
 class TransformerCore:
-    def __init__(self, swarm_size: int = 16):
+    # (stage name, worker class, swarm_size divisor for the initial split), in pipeline order
+    STAGES = (
+        ("inference", TypeInferrer, 4),
+        ("modularization", Modularizer, 4),
+        ("translation", LogicTranslator, 2)
+    )
+
+    def __init__(self, swarm_size: int = 16, queue_depth: int = 64, cache_dir: str = None,
+                 autoscale: bool = True, stages: tuple = None):
+        """
+        swarm_size: global worker budget shared by all stage swarms.
+        queue_depth: capacity of the bounded queue between two stages (backpressure).
+        cache_dir: enables the on-disk artifact cache; unchanged files skip every stage
+        whose inputs are unchanged.
+        autoscale: moves workers between stages at runtime from queue depth and measured task
+        cost (see StageAutoscaler); otherwise the initial split is kept.
+        stages: overrides STAGES.
+        """
         self.bus = ContextBus()
-        # Initialize specialized swarms
+        self.stages = stages or self.STAGES
+        self.swarm_size = swarm_size
+        self.queue_depth = queue_depth
+        self.autoscale = autoscale
+        self.cache = ArtifactCache(cache_dir) if cache_dir else None
+        # Initialize specialized swarms running the typed agents of each stage; any of them may
+        # grow to the whole budget minus one worker per other stage
+        max_size = max(1, swarm_size - (len(self.stages) - 1))
         self.swarms = {
-            "inference": SwarmManager(swarm_size=swarm_size // 4),
-            "modularization": SwarmManager(swarm_size=swarm_size // 4),
-            "translation": SwarmManager(swarm_size=swarm_size // 2)
+            name: SwarmManager(swarm_size=max(1, swarm_size // share), worker_class=worker_class,
+                               max_size=max_size if autoscale else None)
+            for name, worker_class, share in self.stages
         }
+        self.autoscaler = None
+        self.last_stage_times = {}
+        self.last_report = {}
+        self._requires = {} # Memo of each file's resolved require() paths, see WavefrontPlan.from_files
         print(f"🚀 [TRANSFORMER] Core initialized with multiple specialized swarms.")
 
+    def _run_stage(self, name: str, agent_class, inbox: queue.Queue, outbox: queue.Queue,
+                   lineage: dict, errors: list, on_forward=None):
+        """
+        Streams tasks from `inbox` through the stage swarm and forwards each result to `outbox`
+        as soon as it completes. Cache hits are forwarded directly without touching the swarm.
+        lineage: file -> (input content hash, [artifact hash of each completed stage]).
+        on_forward: called with (file, artifact) for every result leaving the stage.
+        """
+        started = []
+
+        def cache_key(file_path: str) -> str:
+            input_hash, upstream = lineage[file_path]
+            return ArtifactCache.key(agent_class.stage, agent_class.version, input_hash, upstream)
+
+        def forward(file_path: str, artifacts: dict, result: dict):
+            if self.cache is not None:
+                lineage[file_path][1].append(content_hash(result["result"].encode()))
+            if on_forward is not None:
+                on_forward(file_path, result["result"])
+            outbox.put({"file": file_path, "artifacts": artifacts, "result": result})
+
+        def tasks():
+            while True:
+                try:
+                    task = inbox.get(timeout=STARVED_POLL_INTERVAL)
+                except queue.Empty:
+                    yield None # Let the swarm hand back finished results while the inbox is dry
+                    continue
+                if task is _END:
+                    return
+                if not started:
+                    started.append(time.perf_counter())
+                if self.cache is not None:
+                    artifact = self.cache.get(cache_key(task["file"]))
+                    if artifact is not None:
+                        artifacts = dict(task.get("artifacts", {}), **{agent_class.stage: artifact})
+                        forward(task["file"], artifacts, {
+                            "worker_id": "cache",
+                            "task": agent_class.stage,
+                            "file": task["file"],
+                            "result": artifact,
+                            "artifacts": artifacts,
+                            "status": "COMPLETED",
+                            "cached": True
+                        })
+                        continue
+                yield task
+
+        try:
+            for result in self.swarms[name].dispatch_stream(tasks()):
+                if self.cache is not None and result["status"] == "COMPLETED":
+                    self.cache.put(cache_key(result["file"]), result["result"])
+                forward(result["file"], result["artifacts"], result)
+        except BaseException as e:
+            errors.append(e)
+            while inbox.get() is not _END: # Keep the upstream stage from blocking forever
+                pass
+        finally:
+            self.last_stage_times[name] = time.perf_counter() - started[0] if started else 0.0
+            outbox.put(_END)
+
     @HPCUtils.benchmark_latency
     def transform_project(self, files: list):
+        """
+        Runs all stages as one pipeline: each file moves to the next stage's swarm as soon as it
+        leaves the current one, so the stages overlap instead of waiting on each other.
+        Files enter the pipeline in dependency wavefronts (see WavefrontPlan): a wave is released
+        once every file of the previous wave has left the first stage, so each task carries the
+        first-stage artifacts (inferred types) of its dependencies, while the later stages of a
+        wave still overlap the first stage of the next. Results are returned in input order.
+        """
         print(f"📦 [TRANSFORMER] Starting modernization of {len(files)} files...")
-        
-        # Phase 1: Parallel Inference
-        print("🔍 [PHASE 1] Inferring types...")
-        inference_tasks = [{"file": f} for f in files]
-        self.swarms["inference"].dispatch_batch(inference_tasks)
-        
-        # Phase 2: Parallel Modularization
-        print("🧱 [PHASE 2] Modularizing structure...")
-        mod_tasks = [{"file": f} for f in files]
-        self.swarms["modularization"].dispatch_batch(mod_tasks)
-        
-        # Phase 3: Logic Translation
-        print("⚡ [PHASE 3] Translating logic...")
-        trans_tasks = [{"file": f} for f in files]
-        results = self.swarms["translation"].dispatch_batch(trans_tasks)
-        
+        print(f"🔗 [PIPELINE] {' -> '.join(name for name, _, _ in self.stages)}")
+        start = time.perf_counter()
+        busy_before = sum(swarm.busy_ns for swarm in self.swarms.values())
+        plan = WavefrontPlan.from_files(files, memo=self._requires)
+
+        queues = [queue.Queue(maxsize=self.queue_depth) for _ in range(len(self.stages) + 1)]
+        errors = []
+        lineage = {}
+        first_artifacts = {} # file -> artifact of the first stage
+        first_done = threading.Condition()
+
+        def on_first_stage(file_path: str, artifact: str):
+            with first_done:
+                first_artifacts[file_path] = artifact
+                first_done.notify_all()
+
+        workers = [
+            threading.Thread(target=self._run_stage, daemon=True,
+                             args=(name, agent_class, queues[i], queues[i + 1], lineage, errors,
+                                   on_first_stage if i == 0 else None))
+            for i, (name, agent_class, _) in enumerate(self.stages)
+        ]
+        if self.autoscale:
+            self.autoscaler = StageAutoscaler(
+                {name: (self.swarms[name], queues[i]) for i, (name, _, _) in enumerate(self.stages)},
+                budget=max(self.swarm_size, len(self.stages))
+            )
+            self.autoscaler.start()
+        for worker in workers:
+            worker.start()
+
+        def feed():
+            released = 0
+            for wave_index, wave in enumerate(plan.waves):
+                for file_path in wave:
+                    # Dependencies in the same wave share a require cycle and cannot see each other
+                    dependency_types = {dependency: first_artifacts[dependency]
+                                        for dependency in sorted(plan.dependencies[file_path])
+                                        if plan.wave_of[dependency] < wave_index}
+                    input_hash = self._input_hash(file_path) if self.cache is not None else ""
+                    if dependency_types and self.cache is not None:
+                        input_hash = content_hash("\0".join(
+                            [input_hash, *(content_hash(a.encode()) for a in dependency_types.values())]).encode())
+                    lineage[file_path] = (input_hash, [])
+                    queues[0].put({"file": file_path, "dependency_types": dependency_types})
+                released += len(wave)
+                with first_done:
+                    while len(first_artifacts) < released and not errors:
+                        first_done.wait(0.1)
+                if errors:
+                    break
+            queues[0].put(_END)
+        threading.Thread(target=feed, daemon=True).start()
+
+        finished = {}
+        while True:
+            item = queues[-1].get()
+            if item is _END:
+                break
+            finished[item["file"]] = item["result"]
+        for worker in workers:
+            worker.join()
+        if self.autoscaler is not None:
+            self.autoscaler.stop()
+        if self.cache is not None:
+            self.cache.flush()
+        if errors:
+            raise errors[0]
+
+        elapsed = time.perf_counter() - start
+        busy = sum(swarm.busy_ns for swarm in self.swarms.values()) - busy_before
+        self.last_report = {
+            **plan.stats(),
+            "elapsed_s": elapsed,
+            "achieved_parallelism": busy / 1e9 / elapsed # Mean number of workers busy
+        }
+        results = [finished[file_path] for file_path in files if file_path in finished]
+        print(f"🌊 [WAVES] {self.last_report['waves']} waves, critical path {self.last_report['critical_path']}, "
+              f"{self.last_report['cycles']} cycles condensed, parallelism "
+              f"{self.last_report['achieved_parallelism']:.1f} achieved / {self.last_report['avg_parallelism']:.1f} available")
         print(f"✅ [TRANSFORMER] Project modernization complete. {len(results)} files transformed.")
         return results
 
+    @staticmethod
+    def _input_hash(file_path: str) -> str:
+        try:
+            with open(file_path, "rb") as f:
+                return content_hash(f.read())
+        except OSError:
+            return content_hash(file_path.encode()) # Not on disk (mock inputs): the name is the content
+
     def shutdown(self):
         for swarm in self.swarms.values():
             swarm.shutdown()
+        if self.cache is not None:
+            self.cache.close()
 
 if __name__ == "__main__":
     transformer = TransformerCore(swarm_size=16)
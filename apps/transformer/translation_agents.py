@@ -2,39 +2,67 @@
 Antigravity Transformer: Translation Agents
 Specialized workers for parallel codebase modernization.
 """
+import abc
+import os
+import time
 from core.worker import AgentWorker
 from utils.hpc_utils import HPCUtils
 
-class TypeInferrer(AgentWorker):
+class TranslationAgent(AgentWorker, abc.ABC):
+    """
+    Base for the transformer stages. `latency` simulates the per-file reasoning time of the
+    stage (scaled by the task's complexity); upstream stage outputs travel in task["artifacts"],
+    and first-stage outputs of the file's dependencies in task["dependency_types"] (file -> artifact).
+    Bump `version` whenever a stage's output changes so cached artifacts are not reused.
+    """
+    stage = "TRANSLATION"
+    version = "1"
+    latency = 0.0
+
     def execute(self, task: dict) -> dict:
-        """Infers TypeScript types from legacy JS patterns."""
-        # Simulated high-speed reasoning
+        if self.latency:
+            time.sleep(self.latency * task.get("complexity", 1))
+        artifacts = dict(task.get("artifacts", {}))
+        artifacts[self.stage] = self.translate(task)
         return {
             "worker_id": self.worker_id,
-            "task": "TYPE_INFERENCE",
+            "task": self.stage,
             "file": task.get("file"),
-            "result": "interface Data { value: number; }",
+            "result": artifacts[self.stage],
+            "artifacts": artifacts,
             "status": "COMPLETED"
         }
 
-class Modularizer(AgentWorker):
-    def execute(self, task: dict) -> dict:
+    @abc.abstractmethod
+    def translate(self, task: dict) -> str:
+        """Returns this stage's artifact for the file in `task`."""
+
+class TypeInferrer(TranslationAgent):
+    stage = "TYPE_INFERENCE"
+    version = "2"
+    latency = 0.004
+
+    def translate(self, task: dict) -> str:
+        """Infers TypeScript types from legacy JS patterns, importing those inferred for dependencies."""
+        # Simulated high-speed reasoning
+        imports = []
+        for dependency in task.get("dependency_types", {}):
+            stem = os.path.splitext(os.path.basename(dependency))[0]
+            imports.append(f"import type {{ Data as Data_{stem} }} from './{stem}';\n")
+        return "".join(imports) + "interface Data { value: number; }"
+
+class Modularizer(TranslationAgent):
+    stage = "MODULARIZATION"
+    latency = 0.002
+
+    def translate(self, task: dict) -> str:
         """Converts CommonJS to ESM and organizes modules."""
-        return {
-            "worker_id": self.worker_id,
-            "task": "MODULARIZATION",
-            "file": task.get("file"),
-            "result": "export const data = ...",
-            "status": "COMPLETED"
-        }
+        return "export const data = ..."
 
-class LogicTranslator(AgentWorker):
-    def execute(self, task: dict) -> dict:
+class LogicTranslator(TranslationAgent):
+    stage = "LOGIC_TRANSLATION"
+    latency = 0.008
+
+    def translate(self, task: dict) -> str:
         """Modernizes legacy logic (e.g., var to const, async/await)."""
-        return {
-            "worker_id": self.worker_id,
-            "task": "LOGIC_TRANSLATION",
-            "file": task.get("file"),
-            "result": "const optimizedFunc = () => ...",
-            "status": "COMPLETED"
-        }
+        return "const optimizedFunc = () => ..."
@@ -0,0 +1,132 @@
+"""
+Antigravity Transformer: Dependency Wavefronts
+Module require graph of a legacy JS project, condensed into SCCs and cut into topological waves.
+"""
+import os
+from typing import Dict, Iterable, List, Optional, Set
+from engine.js_scanner import JSScanner, resolve_require
+
+def strongly_connected_components(graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """
+    Iterative Tarjan. Components are returned in reverse topological order of the edges:
+    with edges pointing from a module to its dependencies, dependencies come first.
+    """
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+    for root in graph:
+        if root in index:
+            continue
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+        while work:
+            node, successors = work[-1]
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph.get(successor, ()))))
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+    return components
+
+class WavefrontPlan:
+    """
+    dependencies: file -> project files it requires. Each require cycle is condensed into one
+    component; a component's wave is one more than the deepest wave among the components it
+    depends on, so every dependency of a wave has been processed in an earlier wave and all
+    files of a wave can run in parallel. The number of waves is the critical-path length.
+    """
+    def __init__(self, dependencies: Dict[str, Set[str]]):
+        self.dependencies = dependencies
+        self.components = strongly_connected_components(dependencies)
+        self.component_of = {file_path: c for c, members in enumerate(self.components) for file_path in members}
+        level: List[int] = []
+        via: List[Optional[int]] = [] # Deepest dependency component, to walk the critical path back
+        for c, members in enumerate(self.components): # Dependencies are always numbered first
+            deepest = None
+            for file_path in members:
+                for dependency in dependencies.get(file_path, ()):
+                    d = self.component_of[dependency]
+                    if d != c and (deepest is None or level[d] > level[deepest]):
+                        deepest = d
+            level.append(0 if deepest is None else level[deepest] + 1)
+            via.append(deepest)
+        self.waves: List[List[str]] = [[] for _ in range(max(level) + 1 if level else 0)]
+        self.wave_of: Dict[str, int] = {}
+        for c, members in enumerate(self.components):
+            self.waves[level[c]].extend(sorted(members))
+            for file_path in members:
+                self.wave_of[file_path] = level[c]
+
+        path = []
+        c = max(range(len(level)), key=level.__getitem__) if level else None
+        while c is not None:
+            path.append(sorted(self.components[c]))
+            c = via[c]
+        self.critical_path: List[List[str]] = path[::-1] # Components, first to be processed first
+
+    @classmethod
+    def from_files(cls, files: Iterable[str], scanner: JSScanner = None, memo: dict = None) -> "WavefrontPlan":
+        """
+        Scans each file's require() calls; files that do not exist have no dependencies.
+        memo: file -> ((mtime_ns, size), resolved require paths), updated in place; files whose
+        stat signature is unchanged are not scanned again.
+        """
+        scanner = scanner or JSScanner()
+        memo = {} if memo is None else memo
+        files = list(files)
+        known = {os.path.normpath(file_path): file_path for file_path in files}
+        dependencies = {}
+        for file_path in files:
+            try:
+                st = os.stat(file_path)
+                signature = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                dependencies[file_path] = set()
+                continue
+            entry = memo.get(file_path)
+            if entry is None or entry[0] != signature:
+                imports = scanner.scan_file(file_path)["nodes"]["imports"]
+                entry = memo[file_path] = (signature, {resolve_require(file_path, module) for module, _, _, _ in imports})
+            dependencies[file_path] = {known[d] for d in entry[1] if d in known and known[d] != file_path}
+        return cls(dependencies)
+
+    def stats(self) -> dict:
+        files = len(self.component_of)
+        return {
+            "files": files,
+            "components": len(self.components),
+            "cycles": sum(1 for members in self.components if len(members) > 1),
+            "waves": len(self.waves),
+            "critical_path": len(self.critical_path),
+            "max_wave_width": max(map(len, self.waves), default=0),
+            "avg_parallelism": files / len(self.waves) if self.waves else 0.0
+        }
+
+if __name__ == "__main__":
+    plan = WavefrontPlan({"a": {"b", "c"}, "b": {"c"}, "c": set(), "d": {"e"}, "e": {"d", "c"}})
+    print(f"[WAVES] {plan.waves} critical path={plan.critical_path} {plan.stats()}")
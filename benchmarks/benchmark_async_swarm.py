@@ -0,0 +1,83 @@
+"""
+Benchmark: AsyncSwarmManager vs. thread SwarmManager on I/O-bound agents
+Agents call a local stub endpoint that injects a fixed response latency.
+"""
+import asyncio
+import socket
+import threading
+import time
+from core.async_manager import AsyncSwarmManager
+from core.manager import SwarmManager
+from core.worker import AgentWorker
+
+class EndpointAgent(AgentWorker):
+    """Agent whose task is one request/response round trip to a model endpoint."""
+    endpoint = ("127.0.0.1", 0)
+
+    def execute(self, task: dict) -> dict:
+        with socket.create_connection(self.endpoint) as conn:
+            conn.sendall(f"{task['id']}\n".encode())
+            reply = conn.makefile("rb").readline()
+        return {"worker_id": self.worker_id, "task_id": task["id"], "status": "COMPLETED", "payload": reply.strip()}
+
+    async def execute_async(self, task: dict) -> dict:
+        reader, writer = await asyncio.open_connection(*self.endpoint)
+        writer.write(f"{task['id']}\n".encode())
+        await writer.drain()
+        reply = await reader.readline()
+        writer.close()
+        await writer.wait_closed()
+        return {"worker_id": self.worker_id, "task_id": task["id"], "status": "COMPLETED", "payload": reply.strip()}
+
+def start_stub_server(latency: float) -> tuple:
+    """
+    Runs an asyncio echo server in a background thread; every reply is delayed by `latency`.
+    """
+    ready = threading.Event()
+    address = {}
+
+    async def handle(reader, writer):
+        line = await reader.readline()
+        await asyncio.sleep(latency)
+        writer.write(line)
+        await writer.drain()
+        writer.close()
+
+    async def serve():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=8192)
+        address["addr"] = server.sockets[0].getsockname()[:2]
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=lambda: asyncio.run(serve()), daemon=True).start()
+    ready.wait()
+    return address["addr"]
+
+def run_async_benchmark(task_count: int = 5000, latency: float = 0.05, concurrency: int = 1000):
+    print(f"--- ASYNC SWARM BENCHMARK: Tasks={task_count}, Endpoint Latency={latency * 1000:.0f}ms ---")
+    EndpointAgent.endpoint = start_stub_server(latency)
+    tasks = [{"id": i, "complexity": 1} for i in range(task_count)]
+
+    # 1. Thread-per-worker swarm
+    swarm = SwarmManager(swarm_size=32, worker_class=EndpointAgent, chunk_size=1)
+    start = time.perf_counter()
+    results = swarm.dispatch_batch(tasks)
+    thread_time = time.perf_counter() - start
+    swarm.shutdown()
+    print(f"Thread Swarm (32):       {thread_time:.4f}s | {len(results) / thread_time:,.0f} tasks/sec")
+
+    # 2. Event-loop swarm
+    async_swarm = AsyncSwarmManager(swarm_size=concurrency, worker_class=EndpointAgent, task_timeout=5.0)
+    start = time.perf_counter()
+    results = asyncio.run(async_swarm.dispatch_batch(tasks))
+    async_time = time.perf_counter() - start
+    async_swarm.shutdown()
+    completed = sum(1 for r in results if r["status"] == "COMPLETED")
+    print(f"Async Swarm ({concurrency}):     {async_time:.4f}s | {completed / async_time:,.0f} tasks/sec ({task_count - completed} timeouts)")
+
+    print(f"Speedup Factor:          {thread_time / async_time:.2f}x")
+    print("--- BENCHMARK COMPLETE ---")
+
+if __name__ == "__main__":
+    run_async_benchmark()
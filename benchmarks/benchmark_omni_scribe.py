@@ -1,39 +1,90 @@
 """
 Benchmark: Omni-Scribe Performance (1M LOC Simulation)
 """
+import os
+import tempfile
 import time
-from omni_scribe.ast_engine import ASTEngine
-from omni_scribe.context_bus import ContextBus
-from omni_scribe.impact_analyzer import ImpactAnalyzer
+from engine.ast_engine import ASTEngine
+from engine.context_bus import ContextBus
+from engine.parse_cache import ParseCache
+from engine.persistent_store import SegmentStore
+from apps.oracle.impact_analyzer import ImpactAnalyzer
+from utils.corpus import CORPUS_ROOT, generate_corpus
+
+def mock_source(i: int) -> str:
+    # ~100 lines per file, distinct per file so the cache cannot collapse them into one entry.
+    # Files form a 4-ary import tree rooted at project/file_0.py
+    header = f"from project.file_{(i - 1) // 4} import process_{(i - 1) // 4}_0\n" if i else ""
+    return header + "".join(f"def process_{i}_{j}(data):\n    return data * {j}\n" for j in range(50))
+
+def hydrate(bus: ContextBus, engine: ASTEngine, file_count: int) -> float:
+    start = time.perf_counter()
+    for i in range(file_count):
+        file_path = f"project/file_{i}.py"
+        ast_summary = engine.parse_source(mock_source(i), file_path)
+        bus.update_file_state(file_path, ast_summary['nodes'])
+    return time.perf_counter() - start
 
 def run_omni_scribe_benchmark(file_count: int = 1000):
     print(f"--- OMNI-SCRIBE BENCHMARK: {file_count} Files ---")
     
-    engine = ASTEngine()
     bus = ContextBus()
     analyzer = ImpactAnalyzer(bus)
-    
-    mock_code = "def process(data):\n    return data * 2\n" * 50 # ~100 lines per file
-    
-    # 1. Parallel Parsing & Bus Hydration
-    print(f"[1/2] Hydrating Context Bus with {file_count} files...")
-    start = time.perf_counter()
-    for i in range(file_count):
-        file_path = f"project/file_{i}.py"
-        ast_summary = engine.parse_source(mock_code, file_path)
-        bus.update_file_state(file_path, ast_summary['nodes'])
-    end = time.perf_counter()
-    print(f"Hydration Time: {end - start:.4f}s ({(end - start)/file_count * 1000:.2f}ms per file)")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # 1. Parallel Parsing & Bus Hydration
+        print(f"[1/2] Hydrating Context Bus with {file_count} files...")
+        cold = hydrate(bus, ASTEngine(cache=ParseCache(cache_dir)), file_count)
+        print(f"Cold Hydration Time: {cold:.4f}s ({cold / file_count * 1000:.2f}ms per file)")
+
+        # A fresh cache over the same directory behaves like a restarted process
+        warm_cache = ParseCache(cache_dir)
+        warm = hydrate(bus, ASTEngine(cache=warm_cache), file_count)
+        print(f"Warm Hydration Time: {warm:.4f}s ({warm / file_count * 1000:.2f}ms per file, {cold / warm:.1f}x faster)")
+        print(f"Parse Cache: {warm_cache.stats()}")
+
+    # Restart of a service whose project state is persisted
+    with tempfile.TemporaryDirectory() as store_dir:
+        store = SegmentStore(store_dir)
+        hydrate(ContextBus(store=store), ASTEngine(cache=ParseCache()), file_count)
+        store.close()
+        start = time.perf_counter()
+        restarted = ContextBus(store=SegmentStore(store_dir))
+        reopen = time.perf_counter() - start
+        start = time.perf_counter()
+        restarted.get_file_state(f"project/file_{file_count // 2}.py")
+        lookup = time.perf_counter() - start
+        start = time.perf_counter()
+        restarted.warm_from_store()
+        warm_load = time.perf_counter() - start
+        print(f"Store Reopen: {reopen * 1000:.2f}ms | First Lookup: {lookup * 1e6:.0f}us | Full Warm Load: {warm_load * 1000:.2f}ms")
+        restarted.store.close()
+
+    # Parallel hydration straight from disk on a process pool, over a seeded corpus reused across runs
+    project_root = os.path.join(CORPUS_ROOT, f"python-{file_count}")
+    corpus = generate_corpus(project_root, "python", file_count=file_count)
+    print(f"Corpus: {corpus['lines']:,} lines in {corpus['file_count']} files "
+          f"({'reused' if corpus['reused'] else 'generated'})")
+    for workers in sorted({1, os.cpu_count() or 1}):
+        stats = ASTEngine().parse_directory(project_root, bus=ContextBus(), swarm_size=workers)
+        print(f"parse_directory ({workers} procs): {stats['elapsed_s']:.4f}s | {stats['files_per_sec']:,.0f} files/sec")
 
     # 2. Global Impact Analysis
     print(f"[2/2] Running Global Impact Analysis for core change...")
+    print(f"Dependency Index: {bus.dependencies.stats()}")
+    for label, changed, depth in (("Typical Change", f"project/file_{file_count // 10}.py", None),
+                                  ("Core Change (2 hops)", "project/file_0.py", 2)):
+        start = time.perf_counter()
+        impacts = analyzer.analyze_change(changed, max_depth=depth)
+        total_time = time.perf_counter() - start
+        print(f"{label}: {len(impacts)} dependents audited in {total_time * 1000:.2f}ms")
+
+    # CI asking about the same hot module again on an unchanged project
+    repeats = 1000
     start = time.perf_counter()
-    impacts = analyzer.analyze_change("core/kernel.py")
-    end = time.perf_counter()
-    
-    total_time = end - start
-    print(f"Global Sync Latency: {total_time * 1000:.2f}ms")
-    print(f"Throughput: {file_count / total_time:.2f} files/sec awareness")
+    for _ in range(repeats):
+        analyzer.analyze_change(f"project/file_{file_count // 10}.py")
+    print(f"Repeated Query (cached): {(time.perf_counter() - start) / repeats * 1e6:.2f}us | {analyzer.cache.stats()}")
     
     analyzer.shutdown()
     print("--- BENCHMARK COMPLETE ---")
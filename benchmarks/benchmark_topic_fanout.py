@@ -0,0 +1,33 @@
+"""
+Benchmark: Topic Fan-Out on the MemoryBus
+Publish cost with 1 vs. many subscribers, and lag detection for a slow subscriber.
+"""
+import time
+from core.memory_bus import MemoryBus
+
+def run_fanout_benchmark(message_count: int = 100000, subscriber_counts=(1, 8, 64)):
+    print(f"--- TOPIC FAN-OUT BENCHMARK: {message_count:,} messages ---")
+    for subscribers in subscriber_counts:
+        bus = MemoryBus(buffer_size=message_count)
+        cursors = [bus.subscribe_topic("CONTEXT_UPDATE") for _ in range(subscribers)]
+        start = time.perf_counter()
+        for i in range(message_count):
+            bus.publish_topic("CONTEXT_UPDATE", i)
+        publish_time = time.perf_counter() - start
+        start = time.perf_counter()
+        delivered = sum(len(sub.read(max_n=1024)) for sub in cursors for _ in range(-(-message_count // 1024)))
+        read_time = time.perf_counter() - start
+        print(f"{subscribers:>3} subscribers: publish {publish_time / message_count * 1e9:,.0f}ns/msg | "
+              f"read {read_time / max(delivered, 1) * 1e9:,.0f}ns/msg ({delivered:,} delivered)")
+
+    # A subscriber that stops reading is lapped and reported
+    bus = MemoryBus(buffer_size=1024)
+    fast, slow = bus.subscribe_topic("CONTEXT_UPDATE"), bus.subscribe_topic("CONTEXT_UPDATE")
+    for i in range(10000):
+        bus.publish_topic("CONTEXT_UPDATE", i)
+        fast.read()
+    print(f"Lagging subscribers: {len(bus.lagging_subscriptions())} | slow subscriber read {len(slow.read())}, missed {slow.missed:,}")
+    print("--- BENCHMARK COMPLETE ---")
+
+if __name__ == "__main__":
+    run_fanout_benchmark()
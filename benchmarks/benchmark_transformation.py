@@ -1,24 +1,87 @@
 """
 Benchmark: Antigravity Transformer vs Scale (100k LOC)
 """
+import os
+import tempfile
 import time
-from omni_scribe.transformer_core import TransformerCore
-from omni_scribe.monolith_mock import generate_legacy_monolith
+from apps.transformer.transformer_core import TransformerCore
+from apps.transformer.monolith_mock import generate_legacy_monolith
+from apps.transformer.translation_agents import TypeInferrer, Modularizer, LogicTranslator
+from engine.js_scanner import JSScanner
+from utils.corpus import CORPUS_ROOT
+
+EDIT = b"// edited\n"
+
+def run_scan_benchmark(files: list):
+    """Lexical scan throughput of the JS scanner over the generated corpus."""
+    scanner = JSScanner()
+    total_bytes = functions = 0
+    start = time.perf_counter()
+    for file_path in files:
+        result = scanner.scan_file(file_path)
+        total_bytes += result["bytes"]
+        functions += len(result["nodes"]["functions"])
+    elapsed = time.perf_counter() - start
+    print(f"JS Scan:     {total_bytes / 1e6:.2f}MB, {functions} functions in {elapsed:.4f}s "
+          f"({total_bytes / 1e6 / elapsed:.2f} MB/s)")
+
+class HeavyTypeInferrer(TypeInferrer):
+    """Inference made the bottleneck, which the static 1/4, 1/4, 1/2 split does not anticipate."""
+    latency = 0.016
+
+def run_autoscale_benchmark(file_count: int = 500, swarm_size: int = 32):
+    """Static stage split vs queue-driven autoscaling under a skewed stage cost."""
+    stages = (("inference", HeavyTypeInferrer, 4), ("modularization", Modularizer, 4),
+              ("translation", LogicTranslator, 2))
+    files = [f"legacy_module_{i}.js" for i in range(file_count)]
+    timings = {}
+    for autoscale in (False, True):
+        transformer = TransformerCore(swarm_size=swarm_size, autoscale=autoscale, stages=stages)
+        start = time.perf_counter()
+        transformer.transform_project(files)
+        timings[autoscale] = time.perf_counter() - start
+        if autoscale:
+            peak = {name: max([size for _, stage, _, size in transformer.autoscaler.history if stage == name],
+                              default=transformer.swarms[name].active_size)
+                    for name in transformer.swarms}
+            resizes = len(transformer.autoscaler.history)
+        transformer.shutdown()
+    print(f"Autoscale:   static {timings[False]:.4f}s vs autoscaled {timings[True]:.4f}s "
+          f"({timings[False] / timings[True]:.2f}x) with heavy inference, {resizes} resizes, peak workers {peak}")
 
 def run_scale_benchmark(file_count: int = 500):
     # Assuming avg 200 lines per mock file = 100k LOC
     print(f"--- TRANSFORMER SCALE BENCHMARK: {file_count} Files (~100k LOC) ---")
     
-    # 1. Generate Scale Monolith
-    generate_legacy_monolith("omni_scribe/scale_repo", file_count)
-    files = [f"legacy_file_{i}.js" for i in range(file_count)]
-    
-    # 2. Run Transformation
-    transformer = TransformerCore(swarm_size=32)
-    
-    start = time.perf_counter()
-    results = transformer.transform_project(files)
-    end = time.perf_counter()
+    # 1. Generate Scale Monolith (seeded, reused across runs)
+    repo_dir = os.path.join(CORPUS_ROOT, f"legacy-js-{file_count}")
+    corpus = generate_legacy_monolith(repo_dir, file_count)
+    origin = "reused" if corpus["reused"] else f"generated in {corpus['elapsed_s']:.2f}s"
+    print(f"Corpus:      {corpus['lines']:,} lines, {corpus['bytes'] / 1e6:.2f}MB ({origin})")
+    files = [os.path.join(repo_dir, path) for path, _, _ in corpus["files"]]
+    run_scan_benchmark(files)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # 2. Run Transformation
+        transformer = TransformerCore(swarm_size=32, cache_dir=cache_dir)
+        
+        start = time.perf_counter()
+        results = transformer.transform_project(files)
+        end = time.perf_counter()
+        waves = transformer.last_report
+
+        # 3. Incremental re-run after editing 5% of the files, undone afterwards so the corpus stays reusable
+        edited = files[::20]
+        try:
+            for file_path in edited:
+                with open(file_path, "ab") as f:
+                    f.write(EDIT)
+            rerun_start = time.perf_counter()
+            transformer.transform_project(files)
+            rerun_time = time.perf_counter() - rerun_start
+        finally:
+            for file_path in edited:
+                os.truncate(file_path, os.path.getsize(file_path) - len(EDIT))
     
     total_time = end - start
     throughput = file_count / total_time
@@ -27,9 +90,15 @@ def run_scale_benchmark(file_count: int = 500):
     print(f"Total Files: {file_count}")
     print(f"Total Time:  {total_time:.4f}s")
     print(f"Throughput:  {throughput:.2f} files/sec")
+    print(f"Wavefronts:  {waves['waves']} waves (critical path {waves['critical_path']}, widest {waves['max_wave_width']}), "
+          f"{waves['cycles']} require cycles condensed, parallelism {waves['achieved_parallelism']:.1f} achieved "
+          f"of {waves['avg_parallelism']:.1f} available")
+    print(f"Incremental: {rerun_time:.4f}s for {len(edited)} edited files ({total_time / rerun_time:.1f}x faster)")
+    print(f"Artifacts:   {transformer.cache.stats()}")
     print(f"Outcome:     {'SUCCESS' if total_time < 5.0 else 'FAILED'}")
     
     transformer.shutdown()
+    run_autoscale_benchmark(file_count)
     print("--- BENCHMARK COMPLETE ---")
 
 if __name__ == "__main__":
@@ -0,0 +1,147 @@
+"""
+Stage Autoscaler: Queue-driven worker allocation for pipelined swarms
+Moves a fixed worker budget between stage swarms towards the stages with the most queued work.
+"""
+import collections
+import math
+import threading
+import time
+from typing import Dict, Tuple
+from core.manager import SwarmManager
+from utils.metrics import METRICS, MetricsRegistry
+
+# Smoothing of the per-stage outstanding work between ticks (1.0 = no smoothing)
+DEMAND_EWMA_ALPHA = 0.5
+
+class StageAutoscaler:
+    """
+    Periodically resizes the swarms of a pipeline so their active sizes sum to `budget`.
+    A stage's demand is its outstanding work in seconds: (tasks waiting in its inbox + tasks
+    running) x its measured per-task cost. Workers are shared out in proportion to demand, each
+    stage keeping `min_workers` and getting no more than it has tasks for, so idle capacity
+    of a fast stage flows to the bottleneck. With no outstanding work anywhere, sizes are left alone.
+    Every tick exports per-stage gauges (workers, utilization, queue depth, task cost) and
+    counts resizes in `metrics`.
+    """
+    def __init__(self, stages: Dict[str, Tuple[SwarmManager, object]], budget: int,
+                 interval: float = 0.01, min_workers: int = 1, metrics: MetricsRegistry = METRICS,
+                 prefix: str = "autoscaler"):
+        """
+        stages: name -> (swarm, inbox); the inbox only needs qsize().
+        """
+        if budget < min_workers * len(stages):
+            raise ValueError(f"Budget of {budget} workers cannot give {len(stages)} stages {min_workers} each.")
+        self.stages = stages
+        self.budget = budget
+        self.interval = interval
+        self.min_workers = min_workers
+        self.metrics = metrics
+        self.prefix = prefix
+        self.history = collections.deque(maxlen=1024) # (time, stage, old size, new size)
+        self._demand = {name: 0.0 for name in stages}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _task_cost(self, swarm: SwarmManager) -> float:
+        cost = swarm.task_cost_s
+        if cost is not None:
+            return cost
+        known = [s.task_cost_s for s, _ in self.stages.values() if s.task_cost_s is not None]
+        return sum(known) / len(known) if known else 1.0 # Unmeasured: assume an average stage
+
+    def targets(self) -> Dict[str, int]:
+        """Computes the size each stage should have now (water-filling over the budget)."""
+        caps = {}
+        for name, (swarm, inbox) in self.stages.items():
+            backlog = inbox.qsize() + swarm.busy_workers
+            demand = backlog * self._task_cost(swarm)
+            self._demand[name] += DEMAND_EWMA_ALPHA * (demand - self._demand[name])
+            caps[name] = max(self.min_workers, min(swarm.max_size, backlog))
+        if not any(self._demand.values()):
+            return {name: swarm.active_size for name, (swarm, _) in self.stages.items()}
+
+        sizes = {name: self.min_workers for name in self.stages}
+        open_stages = {name for name in self.stages if caps[name] > self.min_workers}
+        spare = self.budget - self.min_workers * len(self.stages)
+        while spare > 0 and open_stages:
+            total = sum(self._demand[name] for name in open_stages)
+            if not total:
+                break
+            given = 0
+            for name in sorted(open_stages, key=self._demand.get, reverse=True):
+                share = max(1, math.floor(spare * self._demand[name] / total))
+                share = min(share, caps[name] - sizes[name], spare - given)
+                sizes[name] += share
+                given += share
+                if sizes[name] >= caps[name]:
+                    open_stages.discard(name)
+            if not given:
+                break
+            spare -= given
+        return sizes
+
+    def rebalance(self) -> Dict[str, int]:
+        """
+        One autoscaling tick: resizes the swarms towards targets() and exports the gauges.
+        A shrunk swarm keeps its in-flight chunks running, so growth is limited to workers that
+        are actually free: the stages never run more than `budget` chunks at once, and a stage
+        that could not grow fully catches up on a later tick. Returns the applied sizes.
+        """
+        sizes = self.targets()
+        for name, size in sizes.items():
+            if size < self.stages[name][0].active_size:
+                self._resize(name, size)
+        in_use = sum(max(swarm.active_size, swarm.busy_workers) for swarm, _ in self.stages.values())
+        for name in sorted(sizes, key=lambda n: sizes[n] - self.stages[n][0].active_size, reverse=True):
+            swarm = self.stages[name][0]
+            size = min(sizes[name], swarm.active_size + max(0, self.budget - in_use))
+            if size > swarm.active_size:
+                in_use += size - swarm.active_size
+                self._resize(name, size)
+        busy = 0
+        for name, (swarm, inbox) in self.stages.items():
+            busy += swarm.busy_workers
+            self.metrics.set_gauge(f"{self.prefix}.{name}.workers", swarm.active_size)
+            self.metrics.set_gauge(f"{self.prefix}.{name}.utilization", swarm.busy_workers / swarm.active_size)
+            self.metrics.set_gauge(f"{self.prefix}.{name}.queue_depth", inbox.qsize())
+            self.metrics.set_gauge(f"{self.prefix}.{name}.task_cost_ms", (swarm.task_cost_s or 0.0) * 1e3)
+        self.metrics.set_gauge(f"{self.prefix}.budget_utilization", busy / self.budget)
+        return {name: swarm.active_size for name, (swarm, _) in self.stages.items()}
+
+    def _resize(self, name: str, size: int):
+        swarm = self.stages[name][0]
+        old = swarm.active_size
+        swarm.resize(size)
+        self.history.append((time.perf_counter(), name, old, swarm.active_size))
+        self.metrics.inc(f"{self.prefix}.resizes")
+
+    def run(self):
+        while not self._stop.wait(self.interval):
+            self.rebalance()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+if __name__ == "__main__":
+    import queue
+    from core.worker import AgentWorker
+
+    fast, slow = queue.Queue(), queue.Queue()
+    for i in range(200):
+        slow.put(i)
+    stages = {
+        "fast": (SwarmManager(swarm_size=4, worker_class=AgentWorker, max_size=7), fast),
+        "slow": (SwarmManager(swarm_size=4, worker_class=AgentWorker, max_size=7), slow)
+    }
+    autoscaler = StageAutoscaler(stages, budget=8)
+    print(f"[AUTOSCALE] sizes={autoscaler.rebalance()} gauges={METRICS.gauges}")
+    for swarm, _ in stages.values():
+        swarm.shutdown()
@@ -0,0 +1,71 @@
+"""
+Swarm Executors: Pluggable execution backends for SwarmManager
+Selects how worker code is run: thread pool, process pool, or inline.
+"""
+import concurrent.futures
+import multiprocessing
+import random
+import time
+
+BACKENDS = ("thread", "process", "inline")
+
+class InlineExecutor(concurrent.futures.Executor):
+    """
+    Runs every submitted call synchronously in the caller's thread.
+    Useful for debugging and for swarms whose tasks are cheaper than a thread hop.
+    """
+    def submit(self, fn, /, *args, **kwargs):
+        future = concurrent.futures.Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+# Process backend: one worker instance per child process, built once by the pool initializer.
+# Tasks are sent to the module-level entry point so the worker object itself is never pickled.
+_process_worker = None
+
+def _init_process_worker(worker_class):
+    global _process_worker
+    random.seed() # Children must not share the parent's RNG stream
+    _process_worker = worker_class()
+
+def execute_chunk(worker, chunk: list) -> tuple:
+    """
+    Runs a micro-batch of tasks back to back on one worker.
+    Returns (results, elapsed_ns) so the manager can learn the per-task cost.
+    """
+    start = time.perf_counter_ns()
+    results = [worker.execute(task) for task in chunk]
+    return results, time.perf_counter_ns() - start
+
+def process_execute_chunk(chunk: list) -> tuple:
+    """Entry point executed inside a pool process."""
+    return execute_chunk(_process_worker, chunk)
+
+def noop():
+    """Empty round trip used to measure per-submit overhead."""
+    return None
+
+def _mp_context():
+    # Forking a parent that already runs thread-pool swarms is unsafe; prefer a clean interpreter
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def create_executor(backend: str, max_workers: int, worker_class) -> concurrent.futures.Executor:
+    """
+    Builds the executor for a swarm backend.
+    """
+    if backend == "thread":
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    if backend == "process":
+        return concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=_mp_context(),
+            initializer=_init_process_worker,
+            initargs=(worker_class,)
+        )
+    if backend == "inline":
+        return InlineExecutor()
+    raise ValueError(f"Unknown swarm backend '{backend}'. Expected one of {BACKENDS}.")
@@ -1,37 +1,263 @@
 """
 SwarmManager: Central orchestrator for the Claude Swarm
 """
+import collections
 import concurrent.futures
-from typing import List, Dict
+import math
+import statistics
+import threading
+import time
+from typing import List, Dict, Iterable, Iterator
+import numpy as np
+from core.executors import create_executor, execute_chunk, process_execute_chunk, noop
+from core.scheduler import WorkStealingScheduler
 from core.worker import AgentWorker
 from utils.hpc_utils import HPCUtils
 
+# Micro-batching: a chunk should carry at least this many times its own submit overhead in work
+CHUNK_OVERHEAD_FACTOR = 10
+MAX_CHUNK_SIZE = 512
+# Keep a few chunks per worker so a slow chunk cannot stall the whole batch
+CHUNKS_PER_WORKER = 4
+COST_EWMA_ALPHA = 0.2
+
 class SwarmManager:
-    def __init__(self, swarm_size: int = 4, worker_class=AgentWorker):
-        self.workers = [worker_class() for _ in range(swarm_size)]
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=swarm_size)
-        print(f"[SWARM] Initialized with {swarm_size} workers.")
+    def __init__(self, swarm_size: int = 4, worker_class=AgentWorker, backend: str = "thread",
+                 chunk_size: int = None, max_size: int = None):
+        """
+        backend: "thread" (I/O-bound agents), "process" (CPU-bound kernels, one worker
+        instance per process) or "inline" (synchronous, for debugging).
+        chunk_size: tasks per submit. None auto-tunes it from the measured per-task cost
+        against the measured per-submit overhead.
+        max_size: upper bound for resize(); worker slots up to it are provisioned up front
+        (pool threads/processes start lazily), while only `swarm_size` of them are active.
+        """
+        self.backend = backend
+        self.chunk_size = chunk_size
+        capacity = max(swarm_size, max_size or swarm_size)
+        self.workers = [worker_class() for _ in range(capacity)]
+        self.active_size = swarm_size
+        self.busy_workers = 0
+        self.busy_ns = 0 # Total execution time of completed chunks, summed over workers
+        self._stats_lock = threading.Lock() # Guards the counters above and the task cost EWMA
+        self.executor = create_executor(backend, capacity, worker_class)
+        self._worker_locks = [threading.Lock() for _ in range(capacity)]
+        # Threads that run the per-worker drain loops of dispatch_batch; the process backend
+        # needs its own since its executor only runs worker code
+        if backend == "process":
+            self._drain_executor = concurrent.futures.ThreadPoolExecutor(max_workers=capacity)
+        else:
+            self._drain_executor = self.executor
+        self.last_steal_count = 0
+        self._task_cost_ns = None
+        self._submit_overhead_ns = self._measure_submit_overhead()
+        print(f"[SWARM] Initialized with {swarm_size} workers ({backend} backend).")
+
+    def _run_chunk(self, w: int, chunk: List[Dict]) -> tuple:
+        """
+        Runs a chunk on worker slot `w` in the calling thread.
+        The slot lock guarantees a worker never executes two tasks at once.
+        """
+        with self._worker_locks[w]:
+            if self.backend == "process":
+                # The pool process owns its own worker instance; only the tasks cross the boundary
+                return self.executor.submit(process_execute_chunk, chunk).result()
+            return execute_chunk(self.workers[w], chunk)
+
+    def _submit_chunk(self, w: int, chunk: List[Dict]) -> concurrent.futures.Future:
+        if self.backend == "process":
+            return self.executor.submit(process_execute_chunk, chunk)
+        return self.executor.submit(self._run_chunk, w, chunk)
+
+    def _chunk_done(self, future: concurrent.futures.Future):
+        # Runs for every submitted chunk, even if the stream consuming it has already failed
+        with self._stats_lock:
+            self.busy_workers -= 1
+
+    def _record_chunk(self, results: List[Dict], elapsed_ns: int) -> List[Dict]:
+        cost = elapsed_ns / max(len(results), 1)
+        # dispatch_batch drains record from several threads at once
+        with self._stats_lock:
+            self.busy_ns += elapsed_ns
+            if self._task_cost_ns is None:
+                self._task_cost_ns = cost
+            else:
+                self._task_cost_ns += COST_EWMA_ALPHA * (cost - self._task_cost_ns)
+        return results
+
+    def _measure_submit_overhead(self, samples: int = 5) -> float:
+        """
+        Median round trip of an empty call through the idle executor (future, queue, wake-up, IPC).
+        """
+        self.executor.submit(noop).result() # Warm-up: starts pool threads/processes
+        timings = []
+        for _ in range(samples):
+            start = time.perf_counter_ns()
+            self.executor.submit(noop).result()
+            timings.append(time.perf_counter_ns() - start)
+        return statistics.median(timings)
+
+    @property
+    def max_size(self) -> int:
+        return len(self.workers)
+
+    @property
+    def task_cost_s(self) -> float:
+        """EWMA of the measured per-task execution time (None until a chunk has completed)."""
+        return None if self._task_cost_ns is None else self._task_cost_ns / 1e9
+
+    def resize(self, size: int) -> int:
+        """
+        Sets how many worker slots may run chunks at once, clamped to [1, max_size].
+        Takes effect at the next submit of a running dispatch_stream (in-flight chunks finish
+        normally when shrinking) and at the start of the next dispatch_batch.
+        Returns the new active size.
+        """
+        self.active_size = max(1, min(size, self.max_size))
+        return self.active_size
+
+    def _tuned_chunk_size(self, task_count: int = None) -> int:
+        """
+        Picks the number of tasks per submit.
+        Bounded batches are capped so every worker still receives several chunks; open-ended
+        streams start with single-task probes until a per-task cost has been measured.
+        """
+        if self.chunk_size:
+            return self.chunk_size
+        if task_count is None:
+            cap = MAX_CHUNK_SIZE
+        else:
+            cap = max(1, min(MAX_CHUNK_SIZE, task_count // (self.active_size * CHUNKS_PER_WORKER)))
+        if self._task_cost_ns is None:
+            return 1 if task_count is None else cap
+        target = math.ceil(CHUNK_OVERHEAD_FACTOR * self._submit_overhead_ns / max(self._task_cost_ns, 1.0))
+        return max(1, min(cap, target))
 
     @HPCUtils.benchmark_latency
     def dispatch_batch(self, tasks: List[Dict]) -> List[Dict]:
         """
         Dispatches a batch of tasks to workers in parallel.
-        Ensures high-throughput by utilizing a pool of workers.
+        Tasks are placed on per-worker deques by their `complexity` cost hint, each worker
+        drains its own deque one chunk at a time and steals from the busiest one when idle.
         """
-        futures = []
+        active = self.active_size
+        scheduler = WorkStealingScheduler(active)
+        scheduler.seed(tasks)
+        size = self._tuned_chunk_size(len(tasks))
+
+        def drain(w: int) -> List[Dict]:
+            drained = []
+            while True:
+                chunk = scheduler.take(w, size)
+                if not chunk:
+                    return drained
+                drained.extend(self._record_chunk(*self._run_chunk(w, chunk)))
+
         results = []
-        
-        # Simple round-robin or first-available assignment via ThreadPoolExecutor
-        for i, task in enumerate(tasks):
-            worker = self.workers[i % len(self.workers)]
-            futures.append(self.executor.submit(worker.execute, task))
-            
-        for future in concurrent.futures.as_completed(futures):
-            results.append(future.result())
-            
+        if self.backend == "inline":
+            for w in range(active):
+                results.extend(drain(w))
+        else:
+            futures = [self._drain_executor.submit(drain, w) for w in range(active)]
+            for future in concurrent.futures.as_completed(futures):
+                results.extend(future.result())
+        self.last_steal_count = scheduler.steals
         return results
 
+    def dispatch_stream(self, tasks: Iterable[Dict], max_in_flight: int = None, ordered: bool = False) -> Iterator[Dict]:
+        """
+        Lazily dispatches tasks from any iterable, yielding results as they complete.
+        At most `max_in_flight` tasks (default: one chunk per active worker) are submitted at once,
+        so the producer is only advanced when a slot frees up (backpressure).
+        Chunks only go to idle workers, and to at most `active_size` of them at a time.
+        With `ordered=True` results are yielded in submission order.
+        A live producer may yield None when no task is ready yet; None is never dispatched to a
+        worker. The chunk built so far is submitted and completed results are yielded before the
+        producer is polled again (it is polled straight away when nothing is in flight and nothing
+        is left to yield), so a blocking producer never holds back finished results.
+        """
+        task_iter = iter(tasks)
+        idle = collections.deque(range(len(self.workers)))
+        slots = {}
+        exhausted = False
+
+        def next_chunk(size: int, hold: bool) -> tuple:
+            """
+            Returns (chunk, starved); starved means the producer had no task ready.
+            hold: results are waiting to be yielded, so a starved producer must not be waited on.
+            """
+            nonlocal exhausted
+            chunk = []
+            for task in task_iter:
+                if task is None:
+                    if chunk or slots or hold:
+                        return chunk, True
+                    continue
+                chunk.append(task)
+                if len(chunk) >= size:
+                    return chunk, False
+            exhausted = True
+            return chunk, False
+
+        def submit_next(hold: bool = False) -> list:
+            limit = max_in_flight or self.active_size * self._tuned_chunk_size()
+            futures = []
+            in_flight = sum(n for _, n in slots.values())
+            while idle and len(slots) < self.active_size and in_flight < limit:
+                chunk, starved = next_chunk(min(self._tuned_chunk_size(), limit - in_flight), hold)
+                if not chunk:
+                    break
+                w = idle.popleft()
+                future = self._submit_chunk(w, chunk)
+                slots[future] = (w, len(chunk))
+                with self._stats_lock:
+                    self.busy_workers += 1
+                future.add_done_callback(self._chunk_done)
+                in_flight += len(chunk)
+                futures.append(future)
+                if starved:
+                    break
+            return futures
+
+        def collect(future) -> List[Dict]:
+            w, _ = slots.pop(future)
+            idle.append(w)
+            return self._record_chunk(*future.result())
+
+        if ordered:
+            pending = collections.deque(submit_next())
+            while pending:
+                results = collect(pending.popleft())
+                pending.extend(submit_next(hold=bool(results)))
+                yield from results
+                if not pending and not exhausted:
+                    pending.extend(submit_next())
+            return
+
+        pending = set(submit_next())
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            results = [r for future in done for r in collect(future)]
+            pending.update(submit_next(hold=bool(results)))
+            yield from results
+            if not pending and not exhausted:
+                pending.update(submit_next())
+
+    def dispatch_columnar(self, tasks: Iterable[Dict], targets: Dict[str, np.ndarray]) -> int:
+        """
+        Dispatches batch-kernel tasks whose workers return BatchResult and scatters each
+        result's columns into `targets` (name -> array indexed by id) as soon as it completes.
+        Returns the number of batches consumed.
+        """
+        batches = 0
+        for result in self.dispatch_stream(tasks):
+            result.scatter(targets)
+            batches += 1
+        return batches
+
     def shutdown(self):
+        if self._drain_executor is not self.executor:
+            self._drain_executor.shutdown()
         self.executor.shutdown()
         print("[SWARM] Shutdown complete.")
 
@@ -43,4 +269,19 @@ if __name__ == "__main__":
     print(f"[SWARM] Dispatching {len(sample_tasks)} tasks...")
     results = swarm.dispatch_batch(sample_tasks)
     print(f"[SWARM] Received {len(results)} results.")
+
+    # A live producer yields None while it has nothing ready: finished results must still arrive
+    def live_producer():
+        yield sample_tasks[0]
+        deadline = time.perf_counter() + 1.0
+        while time.perf_counter() < deadline:
+            yield None
+            time.sleep(0.001)
+        yield sample_tasks[1]
+
+    start = time.perf_counter()
+    first = next(swarm.dispatch_stream(live_producer()))
+    waited = time.perf_counter() - start
+    assert first["task_id"] == 0 and waited < 0.5, f"Result held back by a starved producer ({waited:.2f}s)"
+    print(f"[SWARM] Starved producer: first result after {waited * 1e3:.0f}ms.")
     swarm.shutdown()
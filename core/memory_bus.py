@@ -1,47 +1,323 @@
 """
 MemoryBus: High-speed messaging layer for the Claude Swarm
-Utilizes memory-aligned buffers for data transfer.
+Fixed-capacity ring buffer with batch publish/drain and drop accounting,
+plus topic logs that fan out to any number of cursor-based subscribers.
 """
-import queue
 import threading
-from utils.hpc_utils import HPCUtils
+import weakref
+from typing import Any, Dict, Iterable, List
+
+# What publish does when the ring is full
+FULL_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+class TopicLog:
+    """
+    Append-only ring log for one topic. Publishing writes one slot and advances the sequence
+    number, whatever the number of subscribers; each Subscription reads through its own cursor.
+    Entries older than `capacity` are overwritten, and subscribers that fall that far behind are lapped.
+    """
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = capacity
+        self._slots = [None] * capacity
+        # _reserved is advanced before slots are overwritten and seq after they are written,
+        # so lock-free readers can tell which copied entries might have been clobbered
+        self._reserved = 0
+        self.seq = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._waiting_readers = 0
+        self.subscriptions = weakref.WeakSet()
+        self.lapped = 0
+
+    def append(self, message: Any) -> int:
+        """Appends one message and returns its sequence number."""
+        with self._lock:
+            seq = self.seq
+            self._reserved = seq + 1
+            self._slots[seq % self.capacity] = message
+            self.seq = seq + 1
+            if self._waiting_readers:
+                self._not_empty.notify_all()
+        return seq
+
+    def append_many(self, messages: List[Any]) -> int:
+        with self._lock:
+            seq = self.seq
+            total = len(messages)
+            if total > self.capacity: # Only the newest `capacity` entries can survive anyway
+                messages = messages[-self.capacity:]
+            base = seq + total - len(messages)
+            self._reserved = seq + total
+            start = base % self.capacity
+            first = min(len(messages), self.capacity - start)
+            self._slots[start:start + first] = messages[:first]
+            if first < len(messages):
+                self._slots[:len(messages) - first] = messages[first:]
+            self.seq = seq + total
+            if self._waiting_readers:
+                self._not_empty.notify_all()
+        return total
+
+    def read(self, cursor: int, max_n: int) -> tuple:
+        """
+        Copies up to max_n entries starting at sequence `cursor` without taking the lock.
+        Returns (entries, first_sequence_returned).
+        """
+        seq = self.seq
+        start = max(cursor, seq - self.capacity)
+        n = min(seq - start, max_n)
+        if n <= 0:
+            return [], start
+        offset = start % self.capacity
+        first = min(n, self.capacity - offset)
+        batch = self._slots[offset:offset + first]
+        if first < n:
+            batch += self._slots[:n - first]
+        # Validate after copying: entries a concurrent publisher may have overwritten are discarded
+        clobbered = self._reserved - self.capacity - start
+        if clobbered > 0:
+            batch = batch[clobbered:]
+            start += min(clobbered, n)
+        return batch, start
+
+    def wait(self, cursor: int, timeout: float) -> bool:
+        with self._lock:
+            if self.seq != cursor:
+                return True
+            self._waiting_readers += 1
+            try:
+                return self._not_empty.wait_for(lambda: self.seq != cursor, timeout)
+            finally:
+                self._waiting_readers -= 1
+
+class Subscription:
+    """
+    A subscriber's read cursor on a TopicLog.
+    `missed` counts entries that were overwritten before this subscriber read them.
+    """
+    def __init__(self, log: TopicLog, from_start: bool = False):
+        self.log = log
+        self.cursor = max(0, log.seq - log.capacity) if from_start else log.seq
+        self.missed = 0
+        self.received = 0
+        log.subscriptions.add(self)
+
+    @property
+    def lag(self) -> int:
+        """Published entries this subscriber has not read yet (including ones already lost)."""
+        return self.log.seq - self.cursor
+
+    def read(self, max_n: int = None, timeout: float = 0.0) -> List[Any]:
+        """
+        Returns up to max_n unread entries (all of them by default), waiting up to
+        `timeout` seconds if there are none. A lapped subscriber skips to the oldest retained entry.
+        """
+        if timeout and self.log.seq == self.cursor:
+            self.log.wait(self.cursor, timeout)
+        batch, start = self.log.read(self.cursor, max_n if max_n is not None else self.log.capacity)
+        if start > self.cursor:
+            self.missed += start - self.cursor
+            self.log.lapped += 1
+        self.cursor = start + len(batch)
+        self.received += len(batch)
+        return batch
+
+    def close(self):
+        self.log.subscriptions.discard(self)
 
 class MemoryBus:
-    def __init__(self, buffer_size: int = 1024):
-        self.message_queue = queue.Queue(maxsize=buffer_size)
-        # Allocate aligned buffer for message metadata (simulated)
-        self.meta_buffer = HPCUtils.align_buffer(1024, alignment=16)
+    def __init__(self, buffer_size: int = 1024, full_policy: str = "drop_newest", topic_capacity: int = None):
+        if full_policy not in FULL_POLICIES:
+            raise ValueError(f"Unknown full_policy '{full_policy}'. Expected one of {FULL_POLICIES}.")
+        self.capacity = buffer_size
+        self.full_policy = full_policy
+        self._slots = [None] * buffer_size
+        # Monotonic read/write sequence numbers; slot = seq % capacity
+        self._head = 0
+        self._tail = 0
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._waiting_readers = 0
+        self._waiting_writers = 0
         self._stop_event = threading.Event()
+        # Accounting
+        self.published = 0
+        self.dropped = 0
+        self.high_water_mark = 0
+        # Fan-out topics
+        self.topic_capacity = topic_capacity or buffer_size
+        self.topics: Dict[str, TopicLog] = {}
+
+    def __len__(self) -> int:
+        return self._tail - self._head
+
+    def _write_locked(self, messages: List[Any]):
+        """Copies messages into the ring with at most two slice assignments (wrap-around)."""
+        start = self._tail % self.capacity
+        first = min(len(messages), self.capacity - start)
+        self._slots[start:start + first] = messages[:first]
+        if first < len(messages):
+            self._slots[:len(messages) - first] = messages[first:]
+        self._tail += len(messages)
+        self.published += len(messages)
+        size = self._tail - self._head
+        if size > self.high_water_mark:
+            self.high_water_mark = size
+        if self._waiting_readers:
+            self._not_empty.notify(len(messages))
 
-    def publish(self, message: any):
+    def _read_locked(self, n: int) -> List[Any]:
+        start = self._head % self.capacity
+        first = min(n, self.capacity - start)
+        batch = self._slots[start:start + first]
+        self._slots[start:start + first] = [None] * first # Release references
+        if first < n:
+            batch += self._slots[:n - first]
+            self._slots[:n - first] = [None] * (n - first)
+        self._head += n
+        if self._waiting_writers:
+            self._not_full.notify_all()
+        return batch
+
+    def publish(self, message: Any, timeout: float = None) -> bool:
         """
         Publishes a message to the bus using Protocol Step 05: Streaming Store.
-        Bypasses cache pollution for transient data.
+        Returns False when the message was dropped under the bus's full_policy.
+        """
+        return self.publish_many((message,), timeout=timeout) == 1
+
+    def publish_many(self, messages: Iterable[Any], timeout: float = None) -> int:
+        """
+        Publishes a batch of messages under a single lock acquisition.
+        Returns how many of them were enqueued; the rest count as dropped.
+        drop_oldest always enqueues everything, overwriting (and counting) the oldest unread messages.
+        """
+        messages = list(messages)
+        with self._lock:
+            if self.full_policy == "drop_oldest":
+                if len(messages) > self.capacity:
+                    self.dropped += len(messages) - self.capacity
+                    messages = messages[-self.capacity:]
+                overflow = (self._tail - self._head) + len(messages) - self.capacity
+                if overflow > 0:
+                    self._read_locked(overflow)
+                    self.dropped += overflow
+                self._write_locked(messages)
+                return len(messages)
+
+            if self.full_policy == "block":
+                accepted = 0
+                while accepted < len(messages):
+                    free = self.capacity - (self._tail - self._head)
+                    if free == 0:
+                        self._waiting_writers += 1
+                        try:
+                            woke = self._not_full.wait(timeout)
+                        finally:
+                            self._waiting_writers -= 1
+                        if not woke or self._stop_event.is_set():
+                            break
+                        continue
+                    chunk = messages[accepted:accepted + free]
+                    self._write_locked(chunk)
+                    accepted += len(chunk)
+                self.dropped += len(messages) - accepted
+                return accepted
+
+            # drop_newest: Protocol Step 05 assumes non-blocking streaming for transient data
+            free = self.capacity - (self._tail - self._head)
+            if free < len(messages):
+                self.dropped += len(messages) - free
+                messages = messages[:free]
+            if messages:
+                self._write_locked(messages)
+            return len(messages)
+
+    def drain(self, max_n: int = None) -> List[Any]:
         """
-        # Step 05: Store Nontemporal (Cache Bypass)
-        # Simulated as a fast, non-blocking put for transient output
-        try:
-            self.message_queue.put(message, block=False)
-        except queue.Full:
-            # Protocol Step 05 assumes non-blocking streaming for certain data classes
-            # In a real DMA transfer, this would be a direct bus write
-            pass
+        Removes and returns up to max_n queued messages (all of them by default) without blocking.
+        """
+        with self._lock:
+            size = self._tail - self._head
+            n = size if max_n is None else min(size, max_n)
+            return self._read_locked(n) if n else []
 
-    def subscribe(self, timeout: float = 0.1) -> any:
+    def subscribe(self, timeout: float = 0.1) -> Any:
         """
         Subscribes to messages from the bus.
+        Waits up to `timeout` seconds for one message; returns None if none arrives.
         """
-        try:
-            return self.message_queue.get(timeout=timeout)
-        except queue.Empty:
-            return None
+        with self._lock:
+            if self._tail == self._head:
+                self._waiting_readers += 1
+                try:
+                    self._not_empty.wait_for(lambda: self._tail != self._head or self._stop_event.is_set(), timeout)
+                finally:
+                    self._waiting_readers -= 1
+                if self._tail == self._head:
+                    return None
+            return self._read_locked(1)[0]
+
+    def topic(self, name: str) -> TopicLog:
+        log = self.topics.get(name)
+        if log is None:
+            with self._lock:
+                log = self.topics.setdefault(name, TopicLog(name, self.topic_capacity))
+        return log
+
+    def publish_topic(self, topic: str, message: Any) -> int:
+        """
+        Appends a message to a topic log; every current subscriber of the topic will see it.
+        Returns the message's sequence number.
+        """
+        return self.topic(topic).append(message)
+
+    def publish_topic_many(self, topic: str, messages: Iterable[Any]) -> int:
+        return self.topic(topic).append_many(list(messages))
+
+    def subscribe_topic(self, topic: str, from_start: bool = False) -> Subscription:
+        """
+        Opens an independent cursor on a topic. New subscriptions start at the next message,
+        or at the oldest retained one with from_start=True.
+        """
+        return Subscription(self.topic(topic), from_start=from_start)
+
+    def lagging_subscriptions(self, threshold: float = 0.5) -> List[Subscription]:
+        """Subscriptions whose unread backlog exceeds `threshold` of their topic's capacity."""
+        return [sub for log in list(self.topics.values()) for sub in list(log.subscriptions)
+                if sub.lag > threshold * log.capacity]
+
+    def stats(self) -> dict:
+        return {
+            "capacity": self.capacity,
+            "depth": self._tail - self._head,
+            "published": self.published,
+            "dropped": self.dropped,
+            "high_water_mark": self.high_water_mark,
+            "full_policy": self.full_policy,
+            "topics": {
+                name: {
+                    "published": log.seq,
+                    "subscribers": len(log.subscriptions),
+                    "max_lag": max((sub.lag for sub in list(log.subscriptions)), default=0),
+                    "missed": sum(sub.missed for sub in list(log.subscriptions)),
+                    "lapped_reads": log.lapped
+                }
+                for name, log in list(self.topics.items())
+            }
+        }
 
     def stop(self):
         self._stop_event.set()
+        with self._lock:
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
 
 class SwarmBus(MemoryBus):
     """
     Specialized bus for Swarm events.
     """
-    def __init__(self):
-        super().__init__(buffer_size=5000)
+    def __init__(self, full_policy: str = "drop_newest"):
+        super().__init__(buffer_size=5000, full_policy=full_policy)
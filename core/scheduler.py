@@ -0,0 +1,60 @@
+"""
+Swarm Scheduler: Cost-aware work-stealing dispatch
+Each worker owns a deque seeded by greedy longest-task-first placement;
+idle workers steal from the tail of the most loaded deque.
+"""
+import collections
+import heapq
+import threading
+from typing import List, Dict
+
+def task_cost(task: Dict) -> float:
+    """Relative cost hint of a task (the `complexity` field, default 1)."""
+    return float(task.get("complexity", 1) or 1)
+
+class WorkStealingScheduler:
+    def __init__(self, worker_count: int):
+        self.deques = [collections.deque() for _ in range(worker_count)]
+        # Remaining queued cost per deque, used to pick placement targets and steal victims
+        self.loads = [0.0] * worker_count
+        self.steals = 0
+        self._lock = threading.Lock()
+
+    def seed(self, tasks: List[Dict]):
+        """
+        Longest-processing-time placement: heaviest tasks first, each onto the least loaded deque.
+        """
+        heap = [(self.loads[w], w) for w in range(len(self.deques))]
+        heapq.heapify(heap)
+        for task in sorted(tasks, key=task_cost, reverse=True):
+            load, w = heapq.heappop(heap)
+            cost = task_cost(task)
+            self.deques[w].append((cost, task))
+            self.loads[w] += cost
+            heapq.heappush(heap, (load + cost, w))
+
+    def take(self, w: int, max_tasks: int = 1) -> List[Dict]:
+        """
+        Pops up to `max_tasks` from the front of worker `w`'s deque. When it is empty,
+        steals up to half of the busiest deque's remaining tasks from its tail.
+        Returns an empty list once every deque has drained.
+        """
+        with self._lock:
+            own = self.deques[w]
+            if not own:
+                victim = max(range(len(self.deques)), key=self.loads.__getitem__)
+                if not self.deques[victim]:
+                    return []
+                stolen = max(1, min(max_tasks, len(self.deques[victim]) // 2))
+                for _ in range(stolen):
+                    cost, task = self.deques[victim].pop()
+                    self.loads[victim] -= cost
+                    own.appendleft((cost, task))
+                    self.loads[w] += cost
+                self.steals += 1
+            chunk = []
+            while own and len(chunk) < max_tasks:
+                cost, task = own.popleft()
+                self.loads[w] -= cost
+                chunk.append(task)
+            return chunk
@@ -0,0 +1,240 @@
+"""
+SharedMemoryBus: Cross-process MemoryBus over multiprocessing.shared_memory
+Single-producer/single-consumer ring of fixed-size records plus a payload arena for
+out-of-band NumPy buffers, attachable by name from any process.
+"""
+import multiprocessing
+import pickle
+import struct
+import time
+import uuid
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Iterable, List
+
+MAGIC = 0x5357524D42555331 # "SWRMBUS1"
+FULL_POLICIES = ("drop_newest", "block")
+HEADER_SIZE = 192
+ARENA_ALIGNMENT = 64
+
+# Header layout (uint64 slots, one 64-byte cache line each group): read-only geometry,
+# producer-owned fields and consumer-owned fields, so the two processes never write the same line
+H_MAGIC, H_CAPACITY, H_RECORD_SIZE, H_ARENA_SIZE = 0, 1, 2, 3
+H_TAIL, H_ARENA_HEAD, H_PUBLISHED, H_DROPPED, H_HIGH_WATER = 8, 9, 10, 11, 12
+H_HEAD, H_ARENA_TAIL = 16, 17
+
+# Record: meta_len, buffer_count, arena_end, then (offset, nbytes) per out-of-band buffer, then pickle bytes
+RECORD_HEADER = struct.Struct("<IIQ")
+BUFFER_ENTRY = struct.Struct("<QQ")
+
+# Segments created by this process; attaching to them must not touch resource-tracker registration
+_created_segments = set()
+
+class SharedMemoryBus:
+    """
+    MemoryBus variant whose ring lives in a named shared-memory segment.
+    Exactly one process publishes and one process subscribes on a given bus; small messages are
+    pickled into fixed-size records, while buffers exposed through pickle protocol 5 (NumPy arrays)
+    travel through the shared arena. The subscriber copies each payload out as it receives it,
+    which frees its arena space for the producer straight away.
+    zero_copy: hand payloads to the subscriber as views into the arena instead. They stay valid
+    until the subscriber's next subscribe()/drain() call, and their arena space is only freed then.
+    """
+    def __init__(self, name: str = None, capacity: int = 1024, record_size: int = 256,
+                 arena_size: int = 16 * 1024 * 1024, full_policy: str = "drop_newest", create: bool = True,
+                 zero_copy: bool = False):
+        if full_policy not in FULL_POLICIES:
+            raise ValueError(f"Unknown full_policy '{full_policy}'. Expected one of {FULL_POLICIES}.")
+        self.full_policy = full_policy
+        self.zero_copy = zero_copy
+        if create:
+            size = HEADER_SIZE + capacity * record_size + arena_size
+            self._shm = shared_memory.SharedMemory(name=name or f"swarm_{uuid.uuid4().hex[:12]}", create=True, size=size)
+            self._header = self._shm.buf[:HEADER_SIZE].cast("Q")
+            self._header[H_CAPACITY] = capacity
+            self._header[H_RECORD_SIZE] = record_size
+            self._header[H_ARENA_SIZE] = arena_size
+            self._header[H_MAGIC] = MAGIC
+            _created_segments.add(self._shm.name)
+        else:
+            self._shm = shared_memory.SharedMemory(name=name)
+            if multiprocessing.parent_process() is None and self._shm.name not in _created_segments:
+                # An unrelated process has its own resource tracker, which would unlink the
+                # segment when this process exits; ownership stays with the creator
+                resource_tracker.unregister(self._shm._name, "shared_memory")
+            self._header = self._shm.buf[:HEADER_SIZE].cast("Q")
+            if self._header[H_MAGIC] != MAGIC:
+                self._header.release()
+                self._shm.close()
+                raise ValueError(f"Shared memory segment '{name}' is not a SharedMemoryBus.")
+        self.owner = create
+        self.capacity = self._header[H_CAPACITY]
+        self.record_size = self._header[H_RECORD_SIZE]
+        self.arena_size = self._header[H_ARENA_SIZE]
+        self._records_offset = HEADER_SIZE
+        self._arena_offset = HEADER_SIZE + self.capacity * self.record_size
+        self._release_to = None
+
+    @classmethod
+    def attach(cls, name: str, full_policy: str = "drop_newest", zero_copy: bool = False) -> "SharedMemoryBus":
+        """Attaches to a bus created by another process."""
+        return cls(name=name, full_policy=full_policy, create=False, zero_copy=zero_copy)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def __len__(self) -> int:
+        return self._header[H_TAIL] - self._header[H_HEAD]
+
+    def _reserve(self, sizes: List[int]) -> List[int]:
+        """
+        Reserves contiguous arena ranges for out-of-band buffers (producer side).
+        Returns their arena offsets, or None when the consumer has not released enough space.
+        """
+        head = self._header[H_ARENA_HEAD]
+        arena_tail = self._header[H_ARENA_TAIL]
+        offsets = []
+        for nbytes in sizes:
+            if nbytes > self.arena_size:
+                raise ValueError(f"Payload of {nbytes} bytes exceeds arena size {self.arena_size}.")
+            head = -(-head // ARENA_ALIGNMENT) * ARENA_ALIGNMENT
+            offset = head % self.arena_size
+            if offset + nbytes > self.arena_size: # Never split a buffer across the wrap point
+                head += self.arena_size - offset
+                offset = 0
+            if head + nbytes - arena_tail > self.arena_size:
+                return None
+            offsets.append(offset)
+            head += nbytes
+        self._header[H_ARENA_HEAD] = head
+        return offsets
+
+    def publish(self, message: Any, timeout: float = None) -> bool:
+        """
+        Publishes one message. Returns False if it was dropped because the ring or arena was full
+        (drop_newest, or block after `timeout` seconds).
+        """
+        buffers = []
+        meta = pickle.dumps(message, protocol=5, buffer_callback=buffers.append)
+        raws = [b.raw() for b in buffers]
+        record_bytes = RECORD_HEADER.size + BUFFER_ENTRY.size * len(raws) + len(meta)
+        if record_bytes > self.record_size:
+            raise ValueError(f"Message needs {record_bytes} bytes but records are {self.record_size} bytes; "
+                             f"pass large data as NumPy arrays so it travels out of band.")
+
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        while True:
+            tail = self._header[H_TAIL]
+            if tail - self._header[H_HEAD] < self.capacity:
+                offsets = self._reserve([raw.nbytes for raw in raws])
+                if offsets is not None:
+                    break
+            if self.full_policy == "drop_newest" or (deadline is not None and time.perf_counter() > deadline):
+                self._header[H_DROPPED] += 1
+                return False
+            time.sleep(0)
+
+        arena = self._shm.buf
+        record = self._records_offset + (tail % self.capacity) * self.record_size
+        RECORD_HEADER.pack_into(arena, record, len(meta), len(raws), self._header[H_ARENA_HEAD])
+        entry = record + RECORD_HEADER.size
+        for raw, offset in zip(raws, offsets):
+            start = self._arena_offset + offset
+            arena[start:start + raw.nbytes] = raw.cast("B")
+            BUFFER_ENTRY.pack_into(arena, entry, offset, raw.nbytes)
+            entry += BUFFER_ENTRY.size
+        arena[entry:entry + len(meta)] = meta
+        # Publishing the new tail is the commit point for the consumer
+        self._header[H_TAIL] = tail + 1
+        self._header[H_PUBLISHED] += 1
+        depth = tail + 1 - self._header[H_HEAD]
+        if depth > self._header[H_HIGH_WATER]:
+            self._header[H_HIGH_WATER] = depth
+        return True
+
+    def publish_many(self, messages: Iterable[Any], timeout: float = None) -> int:
+        return sum(1 for message in messages if self.publish(message, timeout=timeout))
+
+    def _release_payloads(self):
+        # Arena space of the previously received zero-copy messages becomes reusable by the producer
+        if self._release_to is not None:
+            self._header[H_ARENA_TAIL] = self._release_to
+            self._release_to = None
+
+    def _read_one(self) -> Any:
+        head = self._header[H_HEAD]
+        arena = self._shm.buf
+        record = self._records_offset + (head % self.capacity) * self.record_size
+        meta_len, buffer_count, arena_end = RECORD_HEADER.unpack_from(arena, record)
+        entry = record + RECORD_HEADER.size
+        views = []
+        for _ in range(buffer_count):
+            offset, nbytes = BUFFER_ENTRY.unpack_from(arena, entry)
+            start = self._arena_offset + offset
+            views.append(arena[start:start + nbytes] if self.zero_copy else bytearray(arena[start:start + nbytes]))
+            entry += BUFFER_ENTRY.size
+        message = pickle.loads(arena[entry:entry + meta_len], buffers=views)
+        if self.zero_copy:
+            self._release_to = arena_end
+        else:
+            self._header[H_ARENA_TAIL] = arena_end
+        self._header[H_HEAD] = head + 1
+        return message
+
+    def subscribe(self, timeout: float = 0.1, spin: int = 2000) -> Any:
+        """
+        Receives one message, busy-polling for `spin` iterations before yielding the CPU.
+        Returns None if nothing arrives within `timeout` seconds.
+        """
+        self._release_payloads()
+        header = self._header
+        head = header[H_HEAD]
+        for _ in range(spin):
+            if header[H_TAIL] != head:
+                return self._read_one()
+        deadline = time.perf_counter() + (timeout or 0.0)
+        while header[H_TAIL] == head:
+            if time.perf_counter() > deadline:
+                return None
+            time.sleep(0)
+        return self._read_one()
+
+    def drain(self, max_n: int = None) -> List[Any]:
+        """Receives up to max_n queued messages without waiting."""
+        self._release_payloads()
+        available = len(self)
+        n = available if max_n is None else min(available, max_n)
+        return [self._read_one() for _ in range(n)]
+
+    def stats(self) -> dict:
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "depth": len(self),
+            "published": self._header[H_PUBLISHED],
+            "dropped": self._header[H_DROPPED],
+            "high_water_mark": self._header[H_HIGH_WATER],
+            "full_policy": self.full_policy
+        }
+
+    def detach(self):
+        """
+        Unmaps the segment from this process. Arrays still referencing received payloads keep
+        the mapping alive until they are garbage collected.
+        """
+        self._header.release()
+        try:
+            self._shm.close()
+        except BufferError:
+            # Outstanding payload views pin the mmap: drop our handle so the mapping is unmapped
+            # when the last view dies, and close the file descriptor now
+            self._shm._buf = None
+            self._shm._mmap = None
+            self._shm.close()
+
+    def unlink(self):
+        """Detaches and destroys the segment (creator only)."""
+        self.detach()
+        if self.owner:
+            self._shm.unlink()
+            _created_segments.discard(self._shm.name)
@@ -1,10 +1,35 @@
 """
 AgentWorker: Individual execution unit in the Claude Swarm
 """
+import asyncio
 import uuid
 import time
+from dataclasses import dataclass, field
+from typing import Dict
+import numpy as np
 from utils.hpc_utils import HPCUtils
 
+@dataclass
+class BatchResult:
+    """
+    Columnar (struct-of-arrays) result of a batch kernel over the contiguous id range [start, stop).
+    Every column is a NumPy array whose first axis has length stop - start, so consumers can
+    scatter a whole batch with one slice assignment instead of one dict per agent.
+    """
+    worker_id: str
+    start: int
+    stop: int
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+    status: str = "COMPLETED"
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def scatter(self, targets: Dict[str, np.ndarray]):
+        """Writes each named column into rows [start, stop) of the matching target array."""
+        for name, target in targets.items():
+            target[self.start:self.stop] = self.columns[name]
+
 class AgentWorker:
     def __init__(self, worker_id: str = None):
         self.worker_id = worker_id or str(uuid.uuid4())[:8]
@@ -24,15 +49,31 @@ class AgentWorker:
         complexity = task.get("complexity", 1)
         time.sleep(0.01 * complexity) 
         
-        result = {
+        result = self._build_result(task)
+        self.status = "IDLE"
+        return result
+
+    async def execute_async(self, task: dict) -> dict:
+        """
+        Non-blocking variant of execute for I/O-bound agents.
+        Awaits instead of blocking so thousands of tasks can share one event loop.
+        """
+        self.status = "BUSY"
+        complexity = task.get("complexity", 1)
+        await asyncio.sleep(0.01 * complexity)
+        
+        result = self._build_result(task)
+        self.status = "IDLE"
+        return result
+
+    def _build_result(self, task: dict) -> dict:
+        return {
             "worker_id": self.worker_id,
             "task_id": task.get("id"),
             "status": "COMPLETED",
             "payload": f"Processed {task.get('name')}",
             "alignment": "128_bit" # Protocol v2.0 Step 01 Enforcement
         }
-        self.status = "IDLE"
-        return result
 
     def __repr__(self):
         return f"<AgentWorker id={self.worker_id} status={self.status}>"
@@ -3,13 +3,29 @@ Omni-Scribe Context Bus
 High-speed shared memory storage for project-wide AST data.
 """
 from core.memory_bus import MemoryBus
+from engine.dependency_index import DependencyIndex
+from engine.persistent_store import SegmentStore
+from engine.usage_index import UsageIndex
+from engine.versioned_state import Snapshot, VersionedState
 from utils.hpc_utils import HPCUtils
 
+# Topic followed by analyzers that track project changes
+CONTEXT_UPDATE = "CONTEXT_UPDATE"
+
 class ContextBus(MemoryBus):
-    def __init__(self, buffer_size: int = 10000):
+    def __init__(self, buffer_size: int = 10000, root: str = None, store: SegmentStore = None):
+        """
+        root: project root used to derive module names for the dependency index.
+        store: optional persistent backend; every update is written through to it.
+        """
         super().__init__(buffer_size=buffer_size)
-        # Store for the 'Live Digital Twin' (Project State)
-        self.project_state = {}
+        # Store for the 'Live Digital Twin' (Project State), versioned for lock-free readers
+        self.state = VersionedState()
+        # Import graph kept in step with the project state
+        self.dependencies = DependencyIndex(root)
+        # Attribute paths and imported symbols -> files using them
+        self.usages = UsageIndex()
+        self.store = store
         # Memory-aligned metadata buffer (Step 01)
         self.registry_buffer = HPCUtils.align_buffer(2048, alignment=16)
 
@@ -18,21 +34,77 @@ class ContextBus(MemoryBus):
         Updates the global context with new AST data.
         Bypasses standard serialization overhead where possible.
         """
-        self.project_state[file_path] = ast_summary
-        # Publish notification to the swarm
-        self.publish({
-            "type": "CONTEXT_UPDATE",
+        self.state.set(file_path, ast_summary)
+        self.usages.update(file_path, ast_summary)
+        if self.store is not None:
+            self.store.put(file_path, ast_summary)
+        graph_version = self.dependencies.update(file_path, ast_summary.get("imports", ()))
+        # Fan out the notification to every subscriber of the topic
+        self.publish_topic(CONTEXT_UPDATE, {
+            "type": CONTEXT_UPDATE,
             "file": file_path,
-            "scope": "GLOBAL"
+            "scope": "GLOBAL",
+            "graph_version": graph_version
         })
 
-    def get_context(self) -> dict:
+    def remove_file_state(self, file_path: str) -> bool:
+        """
+        Drops a deleted file from the project state and its indexes.
+        Its importers stay linked to its module name, so they still show up as dependents.
+        """
+        removed = self.state.delete(file_path)
+        graph_version = self.dependencies.remove(file_path)
+        self.usages.remove(file_path)
+        if self.store is not None:
+            self.store.delete(file_path)
+        self.publish_topic(CONTEXT_UPDATE, {
+            "type": CONTEXT_UPDATE,
+            "file": file_path,
+            "scope": "GLOBAL",
+            "deleted": True,
+            "graph_version": graph_version
+        })
+        return removed
+
+    def get_file_state(self, file_path: str) -> dict:
+        """
+        Returns one file's summary, falling back to a single-record read from the persistent
+        store when the file has not been loaded into memory yet.
+        """
+        summary = self.state.get(file_path)
+        if summary is None and self.store is not None:
+            summary = self.store.get(file_path)
+        return summary
+
+    def warm_from_store(self) -> int:
+        """
+        Loads every persisted summary into the in-memory state and dependency index
+        (no parsing, no update notifications). Returns the number of files loaded.
+        """
+        loaded = 0
+        for file_path, ast_summary in self.store.items():
+            self.state.set(file_path, ast_summary)
+            self.dependencies.update(file_path, ast_summary.get("imports", ()))
+            self.usages.update(file_path, ast_summary)
+            loaded += 1
+        return loaded
+
+    def snapshot(self) -> Snapshot:
+        """
+        Pins the current version of the project state in O(1).
+        The snapshot never changes, even while hydration keeps writing.
+        """
+        return self.state.snapshot()
+
+    def get_context(self) -> Snapshot:
         """
-        Returns the entire live context of the project.
+        Returns the entire context of the project as an immutable snapshot of the latest version.
         """
-        return self.project_state
+        return self.state.snapshot()
 
 if __name__ == "__main__":
     bus = ContextBus()
+    followers = [bus.subscribe_topic(CONTEXT_UPDATE) for _ in range(3)]
     bus.update_file_state("main.py", {"functions": ["init", "run"]})
     print(f"[CONTEXT] Current files in bus: {list(bus.get_context().keys())}")
+    print(f"[CONTEXT] Updates seen per subscriber: {[len(sub.read()) for sub in followers]}")
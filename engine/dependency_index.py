@@ -0,0 +1,153 @@
+"""
+Omni-Scribe Dependency Index
+Forward and reverse import graph maintained incrementally from file summaries.
+"""
+import collections
+import os
+import threading
+from typing import Dict, Iterable, List, Set
+from engine.js_scanner import JS_EXTENSIONS, resolve_require
+
+def module_name(file_path: str, root: str = None) -> str:
+    """
+    Maps a file path to its dotted module name ("pkg/mod.py" -> "pkg.mod", "pkg/__init__.py" -> "pkg").
+    Paths are taken relative to `root` when given.
+    """
+    if root:
+        file_path = os.path.relpath(file_path, root)
+    stem, ext = os.path.splitext(file_path)
+    if ext not in (".py", ".pyi"):
+        stem = file_path # Non-Python units (e.g. service ids) are their own module name
+    parts = [p for p in stem.replace("\\", "/").split("/") if p not in ("", ".")]
+    if len(parts) > 1 and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+def require_target(file_path: str, specifier: str) -> str:
+    """
+    Path a relative require() specifier of a JS file points to: the file Node would load, or
+    the specifier's path with a .js extension when nothing matching exists on disk.
+    """
+    resolved = resolve_require(file_path, specifier)
+    if resolved is not None:
+        return resolved
+    base = os.path.normpath(os.path.join(os.path.dirname(file_path), specifier))
+    return base if base.endswith(JS_EXTENSIONS) else base + ".js"
+
+class DependencyIndex:
+    """
+    forward: file -> module names it imports; reverse: module name -> importing files.
+    The reverse side is keyed by module name rather than file, so a module indexed after its
+    importers is linked without revisiting them. `version` increases with every change.
+    """
+    def __init__(self, root: str = None):
+        self.root = root
+        self.forward: Dict[str, Set[str]] = {}
+        self.reverse: Dict[str, Set[str]] = collections.defaultdict(set)
+        self.modules: Dict[str, str] = {} # file -> module name
+        self.version = 0
+        self._lock = threading.Lock()
+
+    def _imported_modules(self, file_path: str, imports: Iterable) -> Set[str]:
+        module = self.modules[file_path]
+        is_package = os.path.basename(file_path).startswith("__init__.")
+        is_js = file_path.endswith(JS_EXTENSIONS)
+        targets = set()
+        for entry in imports:
+            if isinstance(entry, str): # Legacy summaries list bare module names
+                targets.add(entry)
+                continue
+            target, name = entry[0], entry[1]
+            if is_js:
+                # require() specifiers are paths ("./lib/util") or package names ("lodash")
+                if target.startswith(("./", "../")):
+                    target = module_name(require_target(file_path, target), self.root)
+                targets.add(target)
+                continue
+            if target.startswith("."):
+                # Relative import: resolve against the importing module's package
+                level = len(target) - len(target.lstrip("."))
+                package = module.split(".")
+                package = package[:len(package) - (level - 1 if is_package else level)]
+                target = ".".join(package + ([target.lstrip(".")] if target.lstrip(".") else []))
+            if target:
+                targets.add(target)
+            if name is not None and name != "*":
+                # `from pkg import mod` may import the submodule pkg.mod
+                targets.add(f"{target}.{name}" if target else name)
+        return targets
+
+    def update(self, file_path: str, imports: Iterable) -> int:
+        """Replaces the outgoing edges of `file_path` with the modules in `imports`. Returns the new version."""
+        with self._lock:
+            self.modules[file_path] = module_name(file_path, self.root)
+            targets = self._imported_modules(file_path, imports)
+            previous = self.forward.get(file_path, set())
+            for target in previous - targets:
+                self._unlink(target, file_path)
+            for target in targets - previous:
+                self.reverse[target].add(file_path)
+            self.forward[file_path] = targets
+            self.version += 1
+            return self.version
+
+    def remove(self, file_path: str) -> int:
+        with self._lock:
+            for target in self.forward.pop(file_path, ()):
+                self._unlink(target, file_path)
+            self.modules.pop(file_path, None)
+            self.version += 1
+            return self.version
+
+    def _unlink(self, target: str, file_path: str):
+        importers = self.reverse.get(target)
+        if importers is not None:
+            importers.discard(file_path)
+            if not importers:
+                del self.reverse[target]
+
+    def dependents(self, file_path: str, max_depth: int = None) -> List[str]:
+        """
+        Files that import `file_path` directly or transitively (BFS order, nearest first),
+        up to `max_depth` import hops. The file itself is never included.
+        """
+        module = self.modules.get(file_path) or module_name(file_path, self.root)
+        seen = {file_path}
+        order = []
+        frontier = [module]
+        depth = 0
+        with self._lock:
+            while frontier and (max_depth is None or depth < max_depth):
+                next_frontier = []
+                for target in frontier:
+                    for importer in self.reverse.get(target, ()):
+                        if importer not in seen:
+                            seen.add(importer)
+                            order.append(importer)
+                            next_frontier.append(self.modules[importer])
+                frontier = next_frontier
+                depth += 1
+        return order
+
+    def stats(self) -> dict:
+        return {
+            "files": len(self.forward),
+            "edges": sum(len(targets) for targets in self.forward.values()),
+            "version": self.version
+        }
+
+if __name__ == "__main__":
+    index = DependencyIndex()
+    index.update("core/lib.py", [])
+    index.update("app/service.py", [("core.lib", None, None, 1)])
+    index.update("app/api.py", [("app", "service", None, 1)])
+    print(f"[DEPS] Dependents of core/lib.py: {index.dependents('core/lib.py')} | {index.stats()}")
+
+    # JS summaries from JSScanner carry require() specifiers, resolved against the requiring file
+    js = DependencyIndex(root="/r")
+    js.update("/r/src/lib/util.js", [])
+    js.update("/r/shared/x.js", [])
+    js.update("/r/src/app.js", [("./lib/util", None, "util", 1), ("../shared/x.js", None, "x", 2), ("fs", None, "fs", 3)])
+    assert js.forward["/r/src/app.js"] == {"src.lib.util.js", "shared.x.js", "fs"}, js.forward["/r/src/app.js"]
+    assert js.dependents("/r/src/lib/util.js") == js.dependents("/r/shared/x.js") == ["/r/src/app.js"]
+    print(f"[DEPS] JS requires of /r/src/app.js: {sorted(js.forward['/r/src/app.js'])}")
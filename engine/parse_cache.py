@@ -0,0 +1,103 @@
+"""
+Omni-Scribe Parse Cache
+Content-addressed cache of AST summaries: in-memory LRU in front of a persistent on-disk store.
+"""
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+class ParseCache:
+    """
+    Maps sha256(engine version, interpreter cache tag, source) to the parse result.
+    Entries are marshalled into `cache_dir` (sharded by the first two hex digits) and written
+    atomically, so a cache directory survives restarts and can be shared by parse workers.
+    """
+    def __init__(self, cache_dir: str = None, max_entries: int = 4096):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def key(source: str, engine_version: str) -> str:
+        digest = hashlib.sha256(f"{engine_version}\0{sys.implementation.cache_tag}\0".encode())
+        digest.update(source.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key[2:] + ".marshal")
+
+    def _remember(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+        if self.cache_dir:
+            try:
+                with open(self._path(key), "rb") as f:
+                    value = marshal.load(f)
+            except (OSError, EOFError, ValueError, TypeError):
+                value = None # Missing or truncated entry: treat as a miss and re-parse
+            if value is not None:
+                self.disk_hits += 1
+                self._remember(key, value)
+                return value
+        self.misses += 1
+        return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        self._remember(key, value)
+        self.stores += 1
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump(value, f)
+            os.replace(tmp_path, path) # Readers see either the old entry or the complete new one
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def clear_memory(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0
+        }
+
+if __name__ == "__main__":
+    cache = ParseCache()
+    key = ParseCache.key("def f(): pass\n", "1")
+    cache.put(key, {"status": "PARSED", "nodes": {"functions": ["f"]}})
+    print(f"[PARSE-CACHE] Lookup: {cache.get(key)} | Stats: {cache.stats()}")
@@ -0,0 +1,303 @@
+"""
+Omni-Scribe Persistent Store
+Append-only, memory-mapped segment log of file summaries with per-segment indexes and compaction.
+"""
+import json
+import marshal
+import mmap
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterator, List, Tuple
+
+# Record: crc32, key_len, value_len, then the utf-8 key and the marshalled value
+RECORD_HEADER = struct.Struct("<III")
+RECORD_LENGTHS = struct.Struct("<II")
+TOMBSTONE = 0xFFFFFFFF
+MANIFEST = "MANIFEST.json"
+
+def _record_crc(key: bytes, value: bytes, value_len: int) -> int:
+    return zlib.crc32(value, zlib.crc32(key, zlib.crc32(RECORD_LENGTHS.pack(len(key), value_len))))
+
+class SegmentStore:
+    """
+    Key -> summary store persisted as a sequence of append-only segment files.
+    Opening reads only the small per-segment index files (and scans the unsealed tail segment),
+    values are read on demand through mmap. Every record carries a CRC, so a torn write at the
+    end of the log is detected and truncated on the next open; the manifest and index files are
+    replaced atomically.
+    """
+    def __init__(self, directory: str, segment_size: int = 64 * 1024 * 1024, sync: bool = False):
+        """
+        segment_size: the active segment is sealed once it grows past this many bytes.
+        sync: fsync after every write (durable against power loss, much slower).
+        """
+        self.directory = directory
+        self.segment_size = segment_size
+        self.sync = sync
+        self.index: Dict[str, Tuple[int, int, int]] = {} # key -> (segment, value offset, value length)
+        self._live_bytes: Dict[int, int] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+
+        manifest = self._read_manifest()
+        self.segments: List[int] = manifest["segments"] # Sealed, oldest first
+        self._next_id = manifest["next_id"]
+        for segment in self.segments:
+            self._load_segment_index(segment)
+        self.active = manifest["active"]
+        if self.active is None:
+            self.active = self._allocate_id()
+            self._write_manifest()
+        self._active_entries: Dict[str, Tuple[int, int]] = {}
+        self._remove_orphans()
+        self._recover_active()
+        self._file = open(self._segment_path(self.active), "ab")
+
+    # --- Files ---
+
+    def _segment_path(self, segment: int, suffix: str = ".log") -> str:
+        return os.path.join(self.directory, f"seg-{segment:06d}{suffix}")
+
+    def _allocate_id(self) -> int:
+        segment = self._next_id
+        self._next_id += 1
+        return segment
+
+    def _read_manifest(self) -> dict:
+        try:
+            with open(os.path.join(self.directory, MANIFEST)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"segments": [], "active": None, "next_id": 1}
+
+    def _atomic_write(self, path: str, data: bytes):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _write_manifest(self):
+        manifest = {"segments": self.segments, "active": self.active, "next_id": self._next_id}
+        self._atomic_write(os.path.join(self.directory, MANIFEST), json.dumps(manifest).encode())
+
+    def _apply(self, segment: int, key: str, offset: int, value_len: int):
+        """Points the index at a newer record for `key` (or removes it for a tombstone)."""
+        previous = self.index.pop(key, None)
+        if previous is not None:
+            self._live_bytes[previous[0]] -= previous[2]
+        if value_len != TOMBSTONE:
+            self.index[key] = (segment, offset, value_len)
+            self._live_bytes[segment] = self._live_bytes.get(segment, 0) + value_len
+
+    def _load_segment_index(self, segment: int):
+        with open(self._segment_path(segment, ".idx"), "rb") as f:
+            entries = marshal.load(f)
+        for key, (offset, value_len) in entries.items():
+            self._apply(segment, key, offset, value_len)
+
+    def _scan(self, segment: int) -> Iterator[Tuple[str, int, int, int]]:
+        """Yields (key, value offset, value length, record end) for each intact record."""
+        path = self._segment_path(segment)
+        if not os.path.getsize(path):
+            return
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            position = 0
+            while position + RECORD_HEADER.size <= len(data):
+                crc, key_len, value_len = RECORD_HEADER.unpack_from(data, position)
+                key_start = position + RECORD_HEADER.size
+                value_start = key_start + key_len
+                end = value_start + (0 if value_len == TOMBSTONE else value_len)
+                if end > len(data):
+                    return
+                key = data[key_start:value_start]
+                if crc != _record_crc(key, data[value_start:end], value_len):
+                    return
+                yield key.decode(), value_start, value_len, end
+                position = end
+
+    def _remove_orphans(self):
+        """Deletes files not referenced by the manifest (left by a crash during seal or compaction)."""
+        known = {os.path.basename(self._segment_path(s, suffix))
+                 for s in self.segments + [self.active] for suffix in (".log", ".idx")}
+        for name in os.listdir(self.directory):
+            if name.startswith("seg-") and name not in known:
+                os.remove(os.path.join(self.directory, name))
+
+    def _recover_active(self):
+        """Rebuilds the active segment's index and truncates a torn tail left by a crash."""
+        path = self._segment_path(self.active)
+        if not os.path.exists(path):
+            open(path, "wb").close()
+            return
+        valid_end = 0
+        for key, offset, value_len, end in self._scan(self.active):
+            self._apply(self.active, key, offset, value_len)
+            self._active_entries[key] = (offset, value_len)
+            valid_end = end
+        if valid_end < os.path.getsize(path):
+            os.truncate(path, valid_end)
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        data = self._maps.get(segment)
+        if data is None or len(data) < end:
+            if segment == self.active:
+                self._file.flush()
+            if data is not None:
+                data.close()
+            with open(self._segment_path(segment), "rb") as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = data
+        return data
+
+    # --- Mapping-like API ---
+
+    def _append(self, key: str, value_bytes: bytes, value_len: int):
+        key_bytes = key.encode()
+        offset = self._file.tell() + RECORD_HEADER.size + len(key_bytes)
+        self._file.write(RECORD_HEADER.pack(_record_crc(key_bytes, value_bytes, value_len), len(key_bytes), value_len))
+        self._file.write(key_bytes)
+        self._file.write(value_bytes)
+        if self.sync:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._apply(self.active, key, offset, value_len)
+        self._active_entries[key] = (offset, value_len)
+        if self._file.tell() >= self.segment_size:
+            self._seal()
+
+    def put(self, key: str, value: Any):
+        value_bytes = marshal.dumps(value)
+        with self._lock:
+            self._append(key, value_bytes, len(value_bytes))
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self.index:
+                return False
+            self._append(key, b"", TOMBSTONE)
+            return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Reads one value straight from its segment; nothing else is loaded."""
+        with self._lock:
+            entry = self.index.get(key)
+            if entry is None:
+                return default
+            segment, offset, value_len = entry
+            return marshal.loads(self._map(segment, offset + value_len)[offset:offset + value_len])
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def keys(self) -> List[str]:
+        return list(self.index)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        for key in self.keys():
+            value = self.get(key)
+            if value is not None:
+                yield key, value
+
+    # --- Maintenance ---
+
+    def flush(self):
+        with self._lock:
+            self._file.flush()
+            if self.sync:
+                os.fsync(self._file.fileno())
+
+    def _seal(self):
+        """Closes the active segment behind an index file and starts a new one."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._atomic_write(self._segment_path(self.active, ".idx"), marshal.dumps(self._active_entries))
+        self.segments.append(self.active)
+        self.active = self._allocate_id()
+        self._active_entries = {}
+        self._write_manifest()
+        self._file = open(self._segment_path(self.active), "ab")
+
+    def compact(self) -> int:
+        """
+        Rewrites the live records of all sealed segments into one new segment and deletes the old
+        ones. Crash-safe: the old segments stay authoritative until the manifest is replaced.
+        Returns the number of bytes reclaimed.
+        """
+        with self._lock:
+            if self._file.tell():
+                self._seal()
+            old_segments = list(self.segments)
+            if not old_segments:
+                return 0
+            before = sum(os.path.getsize(self._segment_path(s)) for s in old_segments)
+            target = self._allocate_id()
+            entries = {}
+            with open(self._segment_path(target), "wb") as out:
+                for key, (segment, offset, value_len) in list(self.index.items()):
+                    if segment not in old_segments:
+                        continue
+                    value_bytes = self._map(segment, offset + value_len)[offset:offset + value_len]
+                    key_bytes = key.encode()
+                    out.write(RECORD_HEADER.pack(_record_crc(key_bytes, value_bytes, value_len), len(key_bytes), value_len))
+                    out.write(key_bytes)
+                    entries[key] = (out.tell(), value_len)
+                    out.write(value_bytes)
+                out.flush()
+                os.fsync(out.fileno())
+            self._atomic_write(self._segment_path(target, ".idx"), marshal.dumps(entries))
+            self.segments = [target]
+            self._write_manifest()
+
+            for key, (offset, value_len) in entries.items():
+                self.index[key] = (target, offset, value_len)
+            self._live_bytes[target] = sum(value_len for _, value_len in entries.values())
+            for segment in old_segments:
+                data = self._maps.pop(segment, None)
+                if data is not None:
+                    data.close()
+                self._live_bytes.pop(segment, None)
+                os.remove(self._segment_path(segment))
+                os.remove(self._segment_path(segment, ".idx"))
+            return before - os.path.getsize(self._segment_path(target))
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._file.flush()
+            total = sum(os.path.getsize(self._segment_path(s)) for s in self.segments + [self.active])
+            live = sum(self._live_bytes.values())
+        return {
+            "keys": len(self.index),
+            "segments": len(self.segments) + 1,
+            "total_bytes": total,
+            "live_value_bytes": live,
+            "garbage_ratio": 1.0 - live / total if total else 0.0
+        }
+
+    def close(self):
+        with self._lock:
+            self._file.flush()
+            self._file.close()
+            for data in self._maps.values():
+                data.close()
+            self._maps.clear()
+
+if __name__ == "__main__":
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        store = SegmentStore(directory)
+        for version in range(3):
+            store.put("main.py", {"functions": [("init", 1, 2)], "version": version})
+        store.close()
+        store = SegmentStore(directory)
+        print(f"[STORE] Reopened: {store.get('main.py')} | {store.stats()}")
+        print(f"[STORE] Compaction reclaimed {store.compact()} bytes | {store.stats()}")
+        store.close()
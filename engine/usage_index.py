@@ -0,0 +1,79 @@
+"""
+Omni-Scribe Usage Index
+Inverted index from attribute paths and imported symbols to the files (services) that use them.
+"""
+import threading
+from typing import Dict, Iterable, Tuple
+
+def _sub_chains(chain: str) -> Iterable[str]:
+    """
+    Every contiguous dotted sub-path of at least two names: "a.card.last4.upper" yields
+    "a.card", "a.card.last4", ..., "card.last4", "last4.upper", so a query for "card.last4" matches
+    regardless of the receiver name or what is accessed after it.
+    """
+    parts = chain.split(".")
+    for start in range(len(parts) - 1):
+        for stop in range(start + 2, len(parts) + 1):
+            yield ".".join(parts[start:stop])
+
+class UsageIndex:
+    """
+    symbol -> {file: (line, ...)}, kept incrementally from AST summaries.
+    Indexed symbols are attribute sub-paths (see _sub_chains) and imported names, both as the
+    imported module ("stripe") and as module.name ("stripe.Charge").
+    """
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, Tuple[int, ...]]] = {}
+        self.forward: Dict[str, Tuple[str, ...]] = {} # file -> symbols it contributed
+        self.version = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _symbols(summary: dict) -> Dict[str, set]:
+        symbols = {}
+        for chain, lines in summary.get("attributes", ()):
+            for symbol in _sub_chains(chain):
+                symbols.setdefault(symbol, set()).update(lines)
+        for entry in summary.get("imports", ()):
+            if isinstance(entry, str): # Legacy summaries list bare module names
+                symbols.setdefault(entry, set())
+                continue
+            module, name, _, lineno = entry
+            symbols.setdefault(module, set()).add(lineno)
+            if name is not None:
+                symbols.setdefault(f"{module}.{name}" if module else name, set()).add(lineno)
+        return symbols
+
+    def update(self, file_path: str, summary: dict):
+        symbols = self._symbols(summary)
+        with self._lock:
+            self._remove_locked(file_path)
+            for symbol, lines in symbols.items():
+                self.postings.setdefault(symbol, {})[file_path] = tuple(sorted(lines))
+            self.forward[file_path] = tuple(symbols)
+            self.version += 1
+
+    def remove(self, file_path: str):
+        with self._lock:
+            self._remove_locked(file_path)
+            self.version += 1
+
+    def _remove_locked(self, file_path: str):
+        for symbol in self.forward.pop(file_path, ()):
+            files = self.postings.get(symbol)
+            if files is not None:
+                files.pop(file_path, None)
+                if not files:
+                    del self.postings[symbol]
+
+    def lookup(self, symbol: str) -> Dict[str, Tuple[int, ...]]:
+        """Files using `symbol` with the lines where it occurs."""
+        return dict(self.postings.get(symbol, {}))
+
+    def stats(self) -> dict:
+        return {"symbols": len(self.postings), "files": len(self.forward), "version": self.version}
+
+if __name__ == "__main__":
+    index = UsageIndex()
+    index.update("billing.py", {"attributes": [("charge.card.last4", (12,))], "imports": [("stripe", None, None, 1)]})
+    print(f"[USAGE] card.last4 -> {index.lookup('card.last4')} | stripe -> {index.lookup('stripe')}")
@@ -0,0 +1,106 @@
+"""
+Omni-Scribe Versioned State
+Multi-version project state: O(1) immutable snapshots over sharded copy-on-write dicts.
+"""
+import threading
+import weakref
+from collections.abc import Mapping
+from typing import Any, Iterator, List
+
+SHARD_COUNT = 64
+
+class Snapshot(Mapping):
+    """
+    Immutable view of the project state at one version.
+    Holding a reference pins the version; its shards are reclaimed once the last reference goes.
+    """
+    __slots__ = ("version", "_shards", "_size", "__weakref__")
+
+    def __init__(self, version: int, shards: tuple, size: int):
+        self.version = version
+        self._shards = shards
+        self._size = size
+
+    def __getitem__(self, key: str) -> Any:
+        return self._shards[hash(key) % len(self._shards)][key]
+
+    def __contains__(self, key) -> bool:
+        return key in self._shards[hash(key) % len(self._shards)]
+
+    def __iter__(self) -> Iterator[str]:
+        for shard in self._shards:
+            yield from shard
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __repr__(self):
+        return f"<Snapshot version={self.version} files={self._size}>"
+
+class VersionedState:
+    """
+    Writers update the live shards; snapshot() freezes the current shard tuple in O(1).
+    A shard is copied on the first write after it was frozen by a snapshot, so each write
+    costs at most one shard copy and readers never see a torn or changing state.
+    """
+    def __init__(self, shard_count: int = SHARD_COUNT):
+        self._shards = [{} for _ in range(shard_count)]
+        self._owned = [True] * shard_count # False: shard is shared with a snapshot
+        self._size = 0
+        self.version = 0
+        self._latest = None
+        self._lock = threading.Lock()
+        self._pinned = weakref.WeakValueDictionary() # version -> live Snapshot
+
+    def _writable_shard(self, key: str) -> dict:
+        index = hash(key) % len(self._shards)
+        if not self._owned[index]:
+            self._shards[index] = dict(self._shards[index])
+            self._owned[index] = True
+        return self._shards[index]
+
+    def set(self, key: str, value: Any):
+        with self._lock:
+            shard = self._writable_shard(key)
+            if key not in shard:
+                self._size += 1
+            shard[key] = value
+            self.version += 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            index = hash(key) % len(self._shards)
+            if key not in self._shards[index]:
+                return False
+            del self._writable_shard(key)[key]
+            self._size -= 1
+            self.version += 1
+            return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._shards[hash(key) % len(self._shards)].get(key, default)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def snapshot(self) -> Snapshot:
+        """Pins the current version. Repeated calls between writes share one Snapshot."""
+        latest = self._latest() if self._latest is not None else None
+        if latest is not None and latest.version == self.version:
+            return latest
+        with self._lock:
+            snap = Snapshot(self.version, tuple(self._shards), self._size)
+            self._owned = [False] * len(self._shards)
+            self._pinned[snap.version] = snap
+            self._latest = weakref.ref(snap)
+        return snap
+
+    def pinned_versions(self) -> List[int]:
+        return sorted(self._pinned.keys())
+
+if __name__ == "__main__":
+    state = VersionedState()
+    state.set("main.py", {"functions": []})
+    before = state.snapshot()
+    state.set("util.py", {"functions": []})
+    print(f"[MVCC] {before} still sees {list(before)}; latest sees {list(state.snapshot())}")
@@ -4,72 +4,73 @@ Simulates 1,000 microservices and detects a global contract break in <100ms.
 """
 import time
 import random
-from core.manager import SwarmManager
+from engine.ast_engine import ASTEngine
 from engine.context_bus import ContextBus
 from utils.hpc_utils import HPCUtils
 
+# Service code generators: still on the old contract, already migrated, or not using cards at all
+SERVICE_TEMPLATES = (
+    "import stripe\n\ndef render_receipt_{n}(charge):\n    card = charge.source\n    return f\"**** {{card.last4}}\"\n",
+    "import stripe\n\ndef render_receipt_{n}(charge):\n    return charge.payment_method.card.last4\n",
+    "import logging\n\ndef heartbeat_{n}():\n    logging.getLogger(__name__).info(\"ok\")\n"
+)
+
 class OracleKernel:
     def __init__(self, bus: ContextBus):
         self.bus = bus
-        self.swarm = SwarmManager(swarm_size=32) # High parallelism for 1k services
 
     @HPCUtils.benchmark_latency
     def audit_global_integrity(self, contract_owner: str, change_payload: dict):
         """
-        Audits all services in the mesh for any references to the broken contract.
+        Finds every service still referencing the broken contract.
+        Answered from the Context Bus usage index: exact hits with line numbers, no swarm dispatch.
         """
         print(f"🕵️ [ORACLE] contract_owner '{contract_owner}' updated its schema.")
         print(f"🔍 [ORACLE] Detecting impact of: {change_payload['field']} -> {change_payload['new_path']}")
-        
-        mesh_state = self.bus.get_context()
-        audit_tasks = []
-        
-        for service_id, ast in mesh_state.items():
-            if service_id != contract_owner:
-                audit_tasks.append({
-                    "id": service_id,
-                    "service": service_id,
-                    "target_field": change_payload['field'],
-                    "complexity": 1
-                })
-        
-        print(f"⚡ [ORACLE] Dispatching integrity audits to {len(audit_tasks)} services via Context Bus...")
-        results = self.swarm.dispatch_batch(audit_tasks)
-        
-        breaks = [r['worker_id'] for r in results if random.random() < 0.3] # Simulating actual found breaks
-        return breaks
 
-    def shutdown(self):
-        self.swarm.shutdown()
+        usages = self.bus.usages.lookup(change_payload['field'])
+        migrated = self.bus.usages.lookup(change_payload['new_path'])
+
+        breaks = {}
+        for service_id, lines in usages.items():
+            if service_id == contract_owner:
+                continue
+            # A line that already uses the new path also contains the old sub-path; it is not a break
+            stale = [line for line in lines if line not in migrated.get(service_id, ())]
+            if stale:
+                breaks[service_id] = stale
+        return breaks
 
 def run_oracle_demo():
     print("🚀 [DEMO] Starting Global-Code-Oracle Demonstration...")
     bus = ContextBus()
-    
+    engine = ASTEngine()
+
     # 1. Hydrate Mesh (1,000 Services)
     print("[1/3] Hydrating 1,000-Service Mesh into Shared Memory...")
     for i in range(1000):
-        bus.update_file_state(f"service_{i:03d}", {"imports": ["stripe"], "usage": "card.last4"})
-    
+        source = random.choice(SERVICE_TEMPLATES).format(n=i)
+        bus.update_file_state(f"service_{i:03d}", engine.parse_source(source, f"service_{i:03d}")["nodes"])
+
     oracle = OracleKernel(bus)
-    
+
     # 2. Trigger Breaking Change (Acacia Update)
     acacia_change = {
         "field": "card.last4",
         "new_path": "payment_method.card.last4",
         "type": "BREAKING_STRUCT_CHANGE"
     }
-    
+
     # 3. Solve!
     start = time.perf_counter()
     identified_breaks = oracle.audit_global_integrity("Payment-Processor", acacia_change)
     end = time.perf_counter()
-    
+
     print(f"\n✅ [SOLVED] Identified {len(identified_breaks)} affected services across 1,000 codebases.")
-    print(f"⏱️ [PERFORMANCE] Global Integrity Audit: {(end-start)*1000:.2f}ms")
+    for service_id, lines in list(identified_breaks.items())[:3]:
+        print(f"   ↳ {service_id}: line {', '.join(map(str, lines))}")
+    print(f"⏱️ [PERFORMANCE] Global Integrity Audit: {(end-start)*1000:.3f}ms")
     print(f"🚀 [VERDICT] 1,000x faster than traditional integration testing.")
-    
-    oracle.shutdown()
 
 if __name__ == "__main__":
     run_oracle_demo()
@@ -52,15 +52,15 @@ class PersonaSwarmSIM:
         
         # Optimization: Batch processing for high-volume P2P messages
         # In a real swarm, this would be handled by specialized 'Dispatch' agents
+        messages = []
         for p in self.personas:
             if p.loyalty < intensity:
                 p.is_angry = True
                 angry_count += 1
-                # Use a very low timeout to show 'Best Effort' HPC messaging
-                try:
-                    self.bus.message_queue.put({"from": p.id, "sentiment": "ANGRY"}, block=False)
-                except:
-                    pass # Bus saturation is a feature, not a bug in this demo
+                messages.append({"from": p.id, "sentiment": "ANGRY"})
+        
+        # One ring-buffer write for the whole wave; bus saturation is a feature, not a bug in this demo
+        delivered = self.bus.publish_many(messages)
         
         interaction_end = time.perf_counter()
         
@@ -68,6 +68,8 @@ class PersonaSwarmSIM:
         return {
             "sentiment_score": sentiment_score,
             "angry_agents": angry_count,
+            "delivered_messages": delivered,
+            "dropped_messages": len(messages) - delivered,
             "interaction_time_ms": (interaction_end - interaction_start) * 1000
         }
 
@@ -86,6 +88,7 @@ def run_persona_demo():
     print(f"Angry Agents: {results['angry_agents']}")
     print(f"Brand Sentiment: {results['sentiment_score']:.2f}%")
     print(f"P2P Spread Latency: {results['interaction_time_ms']:.2f}ms for 10,000 interactions")
+    print(f"Bus Delivery: {results['delivered_messages']} delivered, {results['dropped_messages']} dropped (high-water mark {sim.bus.high_water_mark})")
     print(f"🚀 [VERDICT] Real-time market sentiment analysis achieved.")
     
     sim.shutdown()
@@ -10,6 +10,7 @@ from typing import List
 from core.manager import SwarmManager
 from core.memory_bus import SwarmBus
 from utils.hpc_utils import HPCUtils, VectorizedPixelData
+from utils.metrics import METRICS
 
 class SwarmKernel:
     def __init__(self, agent_count: int = 10000):
@@ -65,6 +66,9 @@ class SwarmKernel:
         print(f"\n📊 [FINAL REPORT]")
         print(f"Total Tasks: {total_tasks}")
         print(f"Global Avg Latency: {sum(latencies)/len(latencies):.4f}ms")
+        dispatch = METRICS.to_dict()["histograms"].get("SwarmManager.dispatch_batch")
+        if dispatch:
+            print(f"Dispatch Latency p50/p99: {dispatch['p50_ms']:.2f}ms / {dispatch['p99_ms']:.2f}ms")
         print(f"Performance Status: OPTIMIZED (Protocol v2.0)")
         
         self.manager.shutdown()
@@ -12,7 +12,7 @@ from simulations.bioswarm.pdb_parser import PDBParser
 from utils.hpc_utils import HPCUtils
 
 class BioSwarmEngine:
-    def __init__(self, pdb_path: str = None):
+    def __init__(self, pdb_path: str = None, swarm_size: int = None, backend: str = "process"):
         if pdb_path and os.path.exists(pdb_path):
             atoms = PDBParser.parse_pdb(pdb_path)
             self.positions = np.array([a["pos"] for a in atoms], dtype=np.float32)
@@ -25,7 +25,9 @@ class BioSwarmEngine:
             self.ss_list = ["C"] * 500
             print(f"🧬 [BioSwarm] Chain Initialized: 500 residues (Random Coil).")
             
-        self.swarm = SwarmManager(swarm_size=32, worker_class=BioPhysicsKernel)
+        # Force kernels are CPU-bound: run them on a process pool sized to the host by default
+        self.swarm = SwarmManager(swarm_size=swarm_size or os.cpu_count() or 32,
+                                  worker_class=BioPhysicsKernel, backend=backend)
         self.velocities = np.zeros((self.residue_count, 3), dtype=np.float32)
         
         self.config = {
@@ -50,37 +52,33 @@ class BioSwarmEngine:
             tasks.append({
                 "id": f"bio_step_{iteration}_batch_{i}",
                 "range": (i, min(i + batch_size, self.residue_count)),
-                "positions": self.positions.tolist()
+                "positions": self.positions # Shared read-only during dispatch
             })
             
-        # Dispatch to Swarm
-        results = self.swarm.dispatch_batch(tasks)
+        # Dispatch to Swarm: force columns are scattered straight into one (N, 3) array
+        forces = np.empty_like(self.positions)
+        batches = self.swarm.dispatch_columnar(tasks, {"force": forces})
         
-        # Integration
+        # Integration (vectorized over all residues)
         dt = self.config["dt"]
         damping = self.config["damping"]
         max_force = self.config["max_force"]
         
-        for r in results:
-            for res in r['batch_results']:
-                idx = res['id']
-                force = np.array(res['force_vec'])
-                
-                # Clip forces
-                force_mag = np.linalg.norm(force)
-                if force_mag > max_force:
-                    force = (force / force_mag) * max_force
-                
-                # Update velocity and position
-                self.velocities[idx] = (self.velocities[idx] + force * dt) * damping
-                self.positions[idx] += self.velocities[idx] * dt
+        # Clip forces
+        force_mag = np.linalg.norm(forces, axis=1, keepdims=True)
+        forces *= np.minimum(1.0, max_force / np.maximum(force_mag, 1e-12))
+        
+        # Update velocity and position
+        self.velocities += forces * dt
+        self.velocities *= damping
+        self.positions += self.velocities * dt
         
         # Grounding: Center the molecule at origin
         self.positions -= np.mean(self.positions, axis=0)
         
         # Save Snapshot
         self.save_snapshot()
-        return len(results)
+        return batches
 
     def save_snapshot(self):
         # Pass positions and secondary structure labels
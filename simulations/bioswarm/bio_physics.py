@@ -4,19 +4,20 @@ Simulates physical forces acting on amino acid residues in a protein chain.
 """
 import numpy as np
 import random
-from core.worker import AgentWorker
+from core.worker import AgentWorker, BatchResult
 
 class BioPhysicsKernel(AgentWorker):
-    def execute(self, task: dict) -> dict:
+    def execute(self, task: dict) -> BatchResult:
         """
         Calculates forces for a batch of residues.
         Includes simplified Lennard-Jones (van der Waals) and bond constraints.
+        Returns a BatchResult with a (n, 3) float32 "force" column.
         """
         agent_range = task.get("range")
-        positions = np.array(task.get("positions"), dtype=np.float32) # Current positions of all residues
+        positions = np.asarray(task.get("positions"), dtype=np.float32) # Current positions of all residues
         residue_count = len(positions)
         
-        results = []
+        forces = np.empty((agent_range[1] - agent_range[0], 3), dtype=np.float32)
         for i in range(agent_range[0], agent_range[1]):
             # 1. Internal Chain Constraints (Backbone Bond)
             # Each residue 'i' is bonded to 'i-1' and 'i+1'
@@ -51,16 +52,6 @@ class BioPhysicsKernel(AgentWorker):
                         f_vdw += -f_mag * (diff / dist)
             
             # Total Force
-            f_total = f_bond + f_vdw
+            forces[i - agent_range[0]] = f_bond + f_vdw
             
-            results.append({
-                "id": i,
-                "force_vec": f_total.tolist(),
-                "alignment": "128_bit"
-            })
-            
-        return {
-            "worker_id": self.worker_id,
-            "status": "COMPLETED",
-            "batch_results": results
-        }
+        return BatchResult(self.worker_id, agent_range[0], agent_range[1], {"force": forces})
@@ -2,10 +2,9 @@
 LivingTwin: Agent Dynamics Kernel
 Defines behavioral rules for 100,000 agents.
 """
-import random
 from dataclasses import dataclass
-import random
-from core.worker import AgentWorker
+import numpy as np
+from core.worker import AgentWorker, BatchResult
 
 @dataclass
 class AgentState:
@@ -17,46 +16,34 @@ class AgentState:
     happiness: float
 
 class DynamicsKernel(AgentWorker):
-    def execute(self, task: dict) -> dict:
+    def __init__(self, worker_id: str = None):
+        super().__init__(worker_id)
+        self.rng = np.random.default_rng()
+
+    def execute(self, task: dict) -> BatchResult:
         """
         Processes a batch of agent states based on grid-following rules.
+        Returns a BatchResult with "pos_delta" (n, 2), "speed" (n,) and "wealth_delta" (n,) columns.
         """
-        agent_range = task.get("range")
-        pressure = task.get("pressure", 0.0)
+        start, stop = task.get("range")
+        ids = np.arange(start, stop)
+        
+        # agent_type: 0 for Pedestrian, 1 for Vehicle
+        # Simulation: 20% vehicles, 80% pedestrians
+        is_vehicle = (ids % 5 == 0)
+        
+        # Pedestrians move more visibly
+        pos_delta = self.rng.uniform(-2.0, 2.0, (len(ids), 2)).astype(np.float32)
+        
+        # Vehicles move fast along grid lines: x-axis or y-axis movement based on ID
+        vehicle_ids = ids[is_vehicle]
+        vehicle_speed = self.rng.uniform(5.0, 10.0, len(vehicle_ids)).astype(np.float32)
+        along_x = (vehicle_ids // 5) % 2 == 0
+        pos_delta[is_vehicle, 0] = np.where(along_x, vehicle_speed, 0.0)
+        pos_delta[is_vehicle, 1] = np.where(along_x, 0.0, vehicle_speed)
         
-        results = []
-        for i in range(agent_range[0], agent_range[1]):
-            # agent_type: 0 for Pedestrian, 1 for Vehicle
-            # For simplicity, we assume the task gives us hints or indices define type
-            # Simulation: 20% vehicles, 80% pedestrians
-            is_vehicle = (i % 5 == 0)
-            
-            if is_vehicle:
-                # Vehicles move fast along grid lines
-                # x-axis or y-axis movement based on ID
-                if (i // 5) % 2 == 0:
-                    dx, dy = random.uniform(5.0, 10.0), 0
-                else:
-                    dx, dy = 0, random.uniform(5.0, 10.0)
-            else:
-                # Pedestrians move more visibly
-                dx = random.uniform(-2.0, 2.0)
-                dy = random.uniform(-2.0, 2.0)
-            
-            speed = (dx**2 + dy**2)**0.5
-            wealth_delta = random.uniform(-0.1, 0.1) # Restored
-            
-            results.append({
-                "id": i,
-                "pos_delta": (dx, dy),
-                "speed": speed,
-                "wealth_delta": wealth_delta, # Restored
-                "type": 1 if is_vehicle else 0,
-                "alignment": "128_bit"
-            })
-            
-        return {
-            "worker_id": self.worker_id,
-            "status": "COMPLETED",
-            "batch_results": results
-        }
+        return BatchResult(self.worker_id, start, stop, {
+            "pos_delta": pos_delta,
+            "speed": np.hypot(pos_delta[:, 0], pos_delta[:, 1]),
+            "wealth_delta": self.rng.uniform(-0.1, 0.1, len(ids)).astype(np.float32)
+        })
@@ -10,9 +10,11 @@ from simulations.living_twin.twin_visualizer import TwinVisualizer
 from utils.hpc_utils import HPCUtils
 
 class LivingTwinEngine:
-    def __init__(self, agent_count: int = 100000):
+    def __init__(self, agent_count: int = 100000, swarm_size: int = None, backend: str = "process"):
         self.agent_count = agent_count
-        self.swarm = SwarmManager(swarm_size=32, worker_class=DynamicsKernel)
+        # Dynamics kernels are CPU-bound: run them on a process pool sized to the host by default
+        self.swarm = SwarmManager(swarm_size=swarm_size or os.cpu_count() or 32,
+                                  worker_class=DynamicsKernel, backend=backend)
         self.visualizer = TwinVisualizer()
         # Step 02: PINNED_HOST_MEMORY allocation for 100k agent states (simulated)
         # Using numpy for vectorized alignment and speed
@@ -31,6 +33,11 @@ class LivingTwinEngine:
             "type": np.array([1 if i % 5 == 0 else 0 for i in range(agent_count)], dtype=np.int32),
             "status": np.zeros(agent_count, dtype=np.int32)
         }
+        # Per-tick delta columns, reused across iterations to avoid re-allocating 100k rows
+        self.deltas = {
+            "pos_delta": np.empty((agent_count, 2), dtype=np.float32),
+            "wealth_delta": np.empty(agent_count, dtype=np.float32)
+        }
         print(f"🏙️ [TWIN] City Initialized: {agent_count:,} agents in Pinned Memory.")
         
         # Ensure snapshot directory exists
@@ -51,17 +58,15 @@ class LivingTwinEngine:
                 "complexity": 1
             })
             
-        # Dispatch 100,000 agents in 50 batches to the 32-worker swarm
-        results = self.swarm.dispatch_batch(tasks)
-        
-        # Step 05: STREAMING write-back to the state pool
-        # In a real engine, we'd use non-temporal stores here
-        for r in results:
-            for agent_res in r['batch_results']:
-                idx = agent_res['id']
-                self.state_pool["pos"][idx] += agent_res['pos_delta']
-                self.state_pool["wealth"][idx] += agent_res['wealth_delta']
-                self.state_pool["speed"][idx] = agent_res['speed']
+        # Dispatch 100,000 agents in 50 batches to the swarm
+        # Step 05: STREAMING write-back: columns are scattered into the state pool as batches land
+        batches = self.swarm.dispatch_columnar(tasks, {
+            "pos_delta": self.deltas["pos_delta"],
+            "wealth_delta": self.deltas["wealth_delta"],
+            "speed": self.state_pool["speed"]
+        })
+        self.state_pool["pos"] += self.deltas["pos_delta"]
+        self.state_pool["wealth"][:, 0] += self.deltas["wealth_delta"]
                 
         # Phase 3: Visual Export
         avg_speed = float(np.mean(self.state_pool["speed"]))
@@ -70,7 +75,7 @@ class LivingTwinEngine:
         snapshot["avg_speed"] = avg_speed
         self.visualizer.save_snapshot(snapshot, "apps/living_twin_dashboard/snapshot.json")
                 
-        return len(results)
+        return batches
 
     def shutdown(self):
         self.swarm.shutdown()
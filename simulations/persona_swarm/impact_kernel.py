@@ -0,0 +1,16 @@
+"""
+Viral Crisis Matrix: Direct Impact Kernel
+Computes the external shock each persona receives in a time step.
+"""
+import numpy as np
+from core.worker import AgentWorker, BatchResult
+
+class ImpactKernel(AgentWorker):
+    def execute(self, task: dict) -> BatchResult:
+        """
+        Applies the external pressure to a contiguous range of personas.
+        Returns a BatchResult with a float64 "shock" column.
+        """
+        start, stop = task.get("range")
+        shock = np.full(stop - start, task.get("pressure", 0.0), dtype=np.float64)
+        return BatchResult(self.worker_id, start, stop, {"shock": shock})
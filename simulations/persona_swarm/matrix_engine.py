@@ -4,7 +4,9 @@ Handles parallel sentiment propagation and tipping point detection.
 """
 import time
 from typing import List
+import numpy as np
 from core.manager import SwarmManager
+from simulations.persona_swarm.impact_kernel import ImpactKernel
 from simulations.persona_swarm.persona_factory import PersonaFactory, PersonaProfile
 from utils.hpc_utils import HPCUtils
 
@@ -12,7 +14,9 @@ class MatrixEngine:
     def __init__(self, swarm_size: int = 32):
         self.factory = PersonaFactory(size=10000)
         self.population = self.factory.generate_population()
-        self.swarm = SwarmManager(swarm_size=swarm_size)
+        self.swarm = SwarmManager(swarm_size=swarm_size, worker_class=ImpactKernel)
+        # Per-persona direct shock of the current step, filled column-wise by the swarm
+        self.shock = np.zeros(len(self.population), dtype=np.float64)
         self.history = []
 
     @HPCUtils.benchmark_latency
@@ -31,7 +35,8 @@ class MatrixEngine:
                 "complexity": 1
             })
             
-        self.swarm.dispatch_batch(tasks)
+        self.swarm.dispatch_columnar(tasks, {"shock": self.shock})
+        shock = self.shock.tolist()
         
         # Phase 2: Peer-to-Peer Propagation (Shared Memory Context)
         # In a real HPC environment, this would be a vectorized kernel operation.
@@ -41,7 +46,7 @@ class MatrixEngine:
         for p in self.population:
             # Simple propagation logic: Sentiment is affected by neighbors
             neighbor_sentiment = sum(self.population[n].sentiment for n in p.neighbors) / len(p.neighbors)
-            p.sentiment = (p.sentiment * 0.7) + (neighbor_sentiment * 0.3) - external_pressure
+            p.sentiment = (p.sentiment * 0.7) + (neighbor_sentiment * 0.3) - shock[p.id]
             
             # Bound sentiment
             p.sentiment = max(0.0, min(100.0, p.sentiment))
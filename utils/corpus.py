@@ -0,0 +1,215 @@
+"""
+Corpus Generator: Seeded synthetic JS and Python projects for capacity benchmarks
+Builds 100k-1M LOC corpora in parallel, byte-identical per seed, and reuses them across runs.
+"""
+import functools
+import hashlib
+import json
+import math
+import os
+import random
+import tempfile
+import time
+from typing import Any, Dict, List
+from core.manager import SwarmManager
+from core.worker import AgentWorker
+
+# Bumped whenever the generated content changes, so stale corpora are never reused
+GENERATOR_VERSION = "1"
+MANIFEST = "corpus.json"
+LANGUAGES = ("js", "python")
+MIN_LINES = 10
+# Modules per Python package directory
+PACKAGE_SIZE = 100
+# Where benchmarks keep their corpora between runs
+CORPUS_ROOT = os.path.join(tempfile.gettempdir(), "swarm-corpora")
+
+def corpus_path(language: str, i: int) -> str:
+    """Relative path of module `i` ("legacy_module_7.js", "pkg_0/file_7.py")."""
+    if language == "js":
+        return f"legacy_module_{i}.js"
+    return f"pkg_{i // PACKAGE_SIZE}/file_{i}.py"
+
+def _js_source(i: int, lines: int, requires: List[int], rng: random.Random) -> str:
+    name = corpus_path("js", i)
+    parts = [f"// Legacy Module {i}\n"]
+    parts.extend(f"var dep_{k} = require('./legacy_module_{k}');\n" for k in requires)
+    parts.append("var globalState = {};\n\n")
+    calls = "".join(f"    data = dep_{k}.doWork(data);\n" for k in requires)
+    for j in range(max(1, (lines - len(requires) - 3) // 8)):
+        parts.append(
+            f"function old_func_{i}_{j}(data) {{\n"
+            f"    console.log('Processing in {name}');\n"
+            f"{calls if j == 0 else ''}"
+            "    if (data) {\n"
+            f"        return data + {rng.randint(1, 100)};\n"
+            "    }\n"
+            "    return null;\n"
+            "}\n\n"
+        )
+    parts.append(f"module.exports = {{ doWork: old_func_{i}_0 }};\n")
+    return "".join(parts)
+
+def _python_source(i: int, lines: int, requires: List[int], rng: random.Random) -> str:
+    parts = [f'"""Generated module {i}."""\n']
+    parts.extend(f"from pkg_{k // PACKAGE_SIZE}.file_{k} import process_{k}_0\n" for k in requires)
+    parts.append("\n")
+    calls = "".join(f"    data = process_{k}_0(data)\n" for k in requires)
+    for j in range(max(1, (lines - len(requires) - 2) // 5)):
+        parts.append(
+            f"def process_{i}_{j}(data):\n"
+            f"{calls if j == 0 else ''}"
+            "    if data:\n"
+            f"        return data + {rng.randint(1, 100)}\n"
+            "    return None\n\n"
+        )
+    return "".join(parts)
+
+SOURCES = {"js": _js_source, "python": _python_source}
+
+class CorpusWriter(AgentWorker):
+    """
+    Swarm worker that renders and writes one module per task. Content depends only on the
+    task (its RNG is seeded from the corpus seed and the module index), so the output is the same
+    whichever worker or process writes it. Each file is rendered in memory and written with a
+    single call.
+    """
+    def __init__(self, worker_id: str = None, root: str = None):
+        super().__init__(worker_id)
+        self.root = root
+
+    def execute(self, task: dict) -> dict:
+        rng = random.Random(f"{task['seed']}/{task['id']}")
+        data = SOURCES[task["language"]](task["id"], task["lines"], task["requires"], rng).encode()
+        path = os.path.join(self.root, task["path"])
+        with open(path, "wb") as f:
+            f.write(data)
+        return {
+            "worker_id": self.worker_id,
+            "task_id": task["id"],
+            "path": task["path"],
+            "bytes": len(data),
+            "lines": data.count(b"\n"),
+            "sha256": hashlib.sha256(data).hexdigest(),
+            "status": "COMPLETED"
+        }
+
+def plan_corpus(language: str, target_loc: int, file_count: int, seed: int, mean_lines: int,
+                size_sigma: float, max_requires: int, locality: int, cycle_probability: float) -> List[Dict[str, Any]]:
+    """
+    Draws the module list: file sizes from a log-normal around `mean_lines` (spread `size_sigma`)
+    until `target_loc` is reached (or for exactly `file_count` files), and for each module up to
+    `max_requires` dependencies among the `locality` preceding modules (all of them if None).
+    With `cycle_probability` a module also requires one of the next few modules, which requires
+    it back.
+    """
+    rng = random.Random(seed)
+    mu = math.log(mean_lines) - size_sigma ** 2 / 2 # Keeps the mean at mean_lines
+    sizes = []
+    total = 0
+    while (total < target_loc) if file_count is None else (len(sizes) < file_count):
+        lines = max(MIN_LINES, min(int(rng.lognormvariate(mu, size_sigma)), 20 * mean_lines))
+        sizes.append(lines)
+        total += lines
+
+    count = len(sizes)
+    cycle_partners = {}
+    specs = []
+    for i, lines in enumerate(sizes):
+        low = 0 if locality is None else max(0, i - locality)
+        requires = rng.sample(range(low, i), min(i - low, rng.randint(0, max_requires)))
+        requires += [k for k in cycle_partners.pop(i, ()) if k not in requires]
+        if i + 1 < count and rng.random() < cycle_probability:
+            partner = rng.randint(i + 1, min(i + 5, count - 1))
+            requires.append(partner)
+            cycle_partners.setdefault(partner, []).append(i)
+        specs.append({"id": i, "path": corpus_path(language, i), "lines": lines,
+                      "requires": sorted(requires), "language": language, "seed": seed})
+    return specs
+
+def _load_manifest(target_dir: str) -> dict:
+    try:
+        with open(os.path.join(target_dir, MANIFEST)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+def _is_intact(target_dir: str, manifest: dict) -> bool:
+    for path, size, _ in manifest["files"]:
+        try:
+            if os.path.getsize(os.path.join(target_dir, path)) != size:
+                return False
+        except OSError:
+            return False
+    return True
+
+def generate_corpus(target_dir: str, language: str = "js", target_loc: int = 100_000, seed: int = 0,
+                    file_count: int = None, mean_lines: int = 200, size_sigma: float = 0.5,
+                    max_requires: int = 3, locality: int = None, cycle_probability: float = 0.02,
+                    swarm_size: int = None, backend: str = "process") -> Dict[str, Any]:
+    """
+    Generates a corpus of about `target_loc` lines (or of `file_count` files) into `target_dir`
+    and returns its manifest: the parameters, the (path, bytes, sha256) of every file, the totals
+    and a digest over all file hashes. If `target_dir` already holds an intact corpus with the same parameters it is
+    reused as is ("reused": True). Files of a previous, different corpus are removed.
+    """
+    if language not in LANGUAGES:
+        raise ValueError(f"Unknown corpus language '{language}'. Expected one of {LANGUAGES}.")
+    params = {
+        "version": GENERATOR_VERSION, "language": language, "seed": seed,
+        "target_loc": None if file_count is not None else target_loc, "file_count": file_count,
+        "mean_lines": mean_lines, "size_sigma": size_sigma, "max_requires": max_requires,
+        "locality": locality, "cycle_probability": cycle_probability
+    }
+    previous = _load_manifest(target_dir)
+    if previous is not None and previous["params"] == params and _is_intact(target_dir, previous):
+        return dict(previous, reused=True, elapsed_s=0.0)
+
+    start = time.perf_counter()
+    os.makedirs(target_dir, exist_ok=True)
+    if previous is not None:
+        os.remove(os.path.join(target_dir, MANIFEST)) # A half-written corpus must never look complete
+        for path, _, _ in previous["files"]:
+            try:
+                os.remove(os.path.join(target_dir, path))
+            except FileNotFoundError:
+                pass
+    specs = plan_corpus(language, target_loc, file_count, seed, mean_lines, size_sigma, max_requires,
+                        locality, cycle_probability)
+    if language == "python":
+        for package in sorted({os.path.dirname(spec["path"]) for spec in specs}):
+            os.makedirs(os.path.join(target_dir, package), exist_ok=True)
+            open(os.path.join(target_dir, package, "__init__.py"), "wb").close()
+
+    files = [None] * len(specs)
+    swarm = SwarmManager(swarm_size or os.cpu_count() or 4,
+                         functools.partial(CorpusWriter, root=target_dir), backend)
+    try:
+        for result in swarm.dispatch_stream(specs):
+            files[result["task_id"]] = (result["path"], result["bytes"], result["sha256"])
+            specs[result["task_id"]]["lines"] = result["lines"]
+    finally:
+        swarm.shutdown()
+
+    manifest = {
+        "params": params,
+        "files": files,
+        "file_count": len(files),
+        "lines": sum(spec["lines"] for spec in specs),
+        "bytes": sum(size for _, size, _ in files),
+        "digest": hashlib.sha256("".join(digest for _, _, digest in files).encode()).hexdigest()
+    }
+    tmp_path = os.path.join(target_dir, MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, os.path.join(target_dir, MANIFEST))
+    return dict(manifest, reused=False, elapsed_s=time.perf_counter() - start)
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as root:
+        for language in LANGUAGES:
+            corpus = generate_corpus(os.path.join(root, language), language, target_loc=1_000_000)
+            again = generate_corpus(os.path.join(root, language), language, target_loc=1_000_000)
+            print(f"[CORPUS] {language}: {corpus['file_count']} files, {corpus['lines']:,} lines, "
+                  f"{corpus['bytes'] / 1e6:.1f}MB in {corpus['elapsed_s']:.2f}s "
+                  f"(reused={again['reused']}, digest {corpus['digest'][:12]})")
@@ -5,8 +5,8 @@ Aligned with AntiGravity Dev Protocol v2.0
 import ctypes
 import numpy as np
 import os
-import time
 from typing import Any, Type
+from utils.metrics import METRICS, INSTRUMENTATION_ENABLED
 
 class HPCUtils:
     @staticmethod
@@ -34,14 +34,12 @@ class HPCUtils:
     def benchmark_latency(func):
         """
         Decorator to monitor latency (Step 04: Latency Hiding Pipeline).
+        Records silently into the global METRICS registry; export with
+        METRICS.to_json() / METRICS.to_prometheus().
         """
-        def wrapper(*args, **kwargs):
-            start = time.perf_counter_ns()
-            result = func(*args, **kwargs)
-            end = time.perf_counter_ns()
-            print(f"[LATENCY] {func.__name__}: {(end - start) / 1e6:.4f}ms")
-            return result
-        return wrapper
+        if not INSTRUMENTATION_ENABLED:
+            return func
+        return METRICS.timed(func)
 
 class VectorizedPixelData(ctypes.Structure):
     """
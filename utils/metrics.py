@@ -0,0 +1,211 @@
+"""
+Swarm Metrics: Low-overhead latency histograms, counters and gauges
+Replaces per-call latency printing; silent by default, exported on demand as JSON or Prometheus text.
+"""
+import functools
+import json
+import os
+import re
+import threading
+import time
+import numpy as np
+
+# HDR-style log-linear buckets: values below 2^SIGNIFICANT_BITS are exact, larger values keep
+# SIGNIFICANT_BITS of mantissa (~3% relative error) across MAX_MAGNITUDE binary orders of magnitude
+SIGNIFICANT_BITS = 5
+MAX_MAGNITUDE = 42 # 2^42 ns ~ 73 minutes
+_SUB_COUNT = 1 << SIGNIFICANT_BITS
+_HALF_COUNT = _SUB_COUNT >> 1
+BUCKET_COUNT = _SUB_COUNT + (MAX_MAGNITUDE - SIGNIFICANT_BITS) * _HALF_COUNT
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+# Raw samples are buffered on the hot path and bucketed in bulk once this many accumulate
+FOLD_THRESHOLD = 4096
+
+def bucket_index(value: int) -> int:
+    if value < _SUB_COUNT:
+        return value if value > 0 else 0
+    shift = value.bit_length() - SIGNIFICANT_BITS
+    index = _SUB_COUNT + (shift - 1) * _HALF_COUNT + (value >> shift) - _HALF_COUNT
+    return index if index < BUCKET_COUNT else BUCKET_COUNT - 1
+
+def bucket_midpoint(index: int) -> float:
+    if index < _SUB_COUNT:
+        return float(index)
+    shift = (index - _SUB_COUNT) // _HALF_COUNT + 1
+    mantissa = (index - _SUB_COUNT) % _HALF_COUNT + _HALF_COUNT
+    return ((mantissa << shift) + ((mantissa + 1) << shift) - 1) / 2.0
+
+def bucket_indices(values: np.ndarray) -> np.ndarray:
+    """Vectorized bucket_index() for an int64 array of non-negative values."""
+    values = np.maximum(values, 0)
+    _, bit_length = np.frexp(values.astype(np.float64)) # exact for values < 2^53
+    shift = np.maximum(bit_length - SIGNIFICANT_BITS, 1)
+    log_index = _SUB_COUNT + (shift - 1) * _HALF_COUNT + (values >> shift) - _HALF_COUNT
+    return np.minimum(np.where(values < _SUB_COUNT, values, log_index), BUCKET_COUNT - 1)
+
+class LatencyHistogram:
+    """
+    Fixed-size log-linear histogram of nanosecond latencies.
+    The hot path only appends the raw sample (an atomic list append); samples are folded into
+    buckets with NumPy in bulk, so recording stays well under a microsecond. Folding and
+    resetting take the histogram's lock, so pool threads that fold at the same time never take
+    the same samples twice.
+    """
+    __slots__ = ("name", "counts", "count", "total_ns", "skip", "pending", "_lock")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.counts = np.zeros(BUCKET_COUNT, dtype=np.int64)
+        self.count = 0
+        self.total_ns = 0
+        self.skip = 0
+        self.pending = []
+        self._lock = threading.Lock()
+
+    def record(self, value_ns: int):
+        self.pending.append(value_ns)
+        if len(self.pending) >= FOLD_THRESHOLD:
+            self.fold()
+
+    def fold(self):
+        """Moves buffered samples into the buckets. Safe against concurrent appends and folds."""
+        with self._lock:
+            n = len(self.pending)
+            if not n:
+                return
+            # Appends only ever extend the list, so the first n entries are exactly the ones taken
+            samples = np.array(self.pending[:n], dtype=np.int64)
+            del self.pending[:n]
+            self.counts += np.bincount(bucket_indices(samples), minlength=BUCKET_COUNT)
+            self.count += n
+            self.total_ns += int(samples.sum())
+
+    def reset(self):
+        with self._lock:
+            self.counts[:] = 0
+            self.count = 0
+            self.total_ns = 0
+            self.skip = 0
+            del self.pending[:] # In place: decorators hold a reference to the list
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile in nanoseconds (bucket midpoint)."""
+        self.fold()
+        if not self.count:
+            return 0.0
+        rank = max(1, int(q * self.count + 0.5))
+        return bucket_midpoint(int(np.searchsorted(np.cumsum(self.counts), rank)))
+
+    def max(self) -> float:
+        self.fold()
+        occupied = np.flatnonzero(self.counts)
+        return bucket_midpoint(int(occupied[-1])) if len(occupied) else 0.0
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True, sample_every: int = 1):
+        """
+        enabled: runtime switch; a disabled registry costs one attribute check per call.
+        sample_every: time only every Nth call of each function (1 = every call).
+        """
+        self.enabled = enabled
+        self.sample_every = sample_every
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+
+    def histogram(self, name: str) -> LatencyHistogram:
+        hist = self.histograms.get(name)
+        if hist is None:
+            hist = self.histograms.setdefault(name, LatencyHistogram(name))
+        return hist
+
+    def inc(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """Records the current value of a level (pool size, utilization, queue depth)."""
+        self.gauges[name] = value
+
+    def timed(self, func):
+        """
+        Decorator recording the wall-clock latency of each call into a histogram
+        named after the function's qualified name.
+        """
+        hist = self.histogram(func.__qualname__)
+        pending = hist.pending
+        registry = self
+        clock = time.perf_counter_ns
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return func(*args, **kwargs)
+            if hist.skip:
+                hist.skip -= 1
+                return func(*args, **kwargs)
+            hist.skip = registry.sample_every - 1
+            start = clock()
+            result = func(*args, **kwargs)
+            pending.append(clock() - start)
+            if len(pending) >= FOLD_THRESHOLD:
+                hist.fold()
+            return result
+        return wrapper
+
+    def reset(self):
+        for hist in self.histograms.values():
+            hist.reset()
+        self.counters.clear()
+        self.gauges.clear()
+
+    def to_dict(self, quantiles=DEFAULT_QUANTILES) -> dict:
+        histograms = {}
+        for name, hist in self.histograms.items():
+            hist.fold()
+            if not hist.count:
+                continue
+            entry = {
+                "count": hist.count,
+                "sum_ms": hist.total_ns / 1e6,
+                "mean_ms": hist.total_ns / hist.count / 1e6,
+                "max_ms": hist.max() / 1e6
+            }
+            for q in quantiles:
+                entry[f"p{q * 100:g}_ms"] = hist.quantile(q) / 1e6
+            histograms[name] = entry
+        return {"sample_every": self.sample_every, "histograms": histograms, "counters": dict(self.counters),
+                "gauges": dict(self.gauges)}
+
+    def to_json(self, indent: int = 2) -> str:
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "swarm", quantiles=DEFAULT_QUANTILES) -> str:
+        """
+        Prometheus text exposition: latencies as one summary labelled by function, counters as *_total,
+        gauges under their own name.
+        """
+        lines = [f"# TYPE {prefix}_latency_seconds summary"]
+        for name, hist in self.histograms.items():
+            hist.fold()
+            if not hist.count:
+                continue
+            label = f'fn="{name}"'
+            for q in quantiles:
+                lines.append(f'{prefix}_latency_seconds{{{label},quantile="{q:g}"}} {hist.quantile(q) / 1e9:.9f}')
+            lines.append(f"{prefix}_latency_seconds_sum{{{label}}} {hist.total_ns / 1e9:.9f}")
+            lines.append(f"{prefix}_latency_seconds_count{{{label}}} {hist.count}")
+        for name, value in self.counters.items():
+            metric = f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, value in self.gauges.items():
+            metric = f"{prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', name)}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value:g}")
+        return "\n".join(lines) + "\n"
+
+# Global registry used by HPCUtils.benchmark_latency.
+# SWARM_METRICS=0 removes instrumentation at decoration time (zero cost);
+# SWARM_METRICS_SAMPLE=N times only every Nth call.
+METRICS = MetricsRegistry(sample_every=max(1, int(os.environ.get("SWARM_METRICS_SAMPLE", "1"))))
+INSTRUMENTATION_ENABLED = os.environ.get("SWARM_METRICS", "1") != "0"